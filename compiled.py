@@ -0,0 +1,293 @@
+"""Compiled, read-only representation of a :class:core.Passage.
+
+Frozen Passages are usually only queried, e.g. for bulk analytics over a
+corpus. Navigating the object graph for that allocates a lot (tuple copies
+of the Edges, lists of children and parents, sorted lists of Terminals), so
+:class:CompiledPassage keeps the same graph in flat arrays instead:
+
+    - Every Node is given a contiguous integer index, grouped by Layer (in
+      the order the Layers were added) and sorted within each Layer like
+      :attr:core.Layer.all.
+    - Edges are kept in CSR (compressed sparse row) format: the outgoing
+      Edges of Node i are the Edge indices in range(child_offsets[i],
+      child_offsets[i + 1]), in the same order as the Node's outgoing Edges,
+      and the incoming Edges are kept likewise in the parent arrays.
+    - Node and Edge tags are kept as their integer codes (see
+      :func:core.tag_code), which are the same in all compiled Passages.
+    - The Terminals spanned by each Node (see
+      :meth:layer1.FoundationalNode.get_terminals) and their first and last
+      positions are computed once.
+
+Queries take and return integer indices, and sequences are returned as
+memoryview objects over the arrays, so no per-query lists are created.
+Use :meth:core.Passage.compile to get the compiled view of a Passage.
+
+"""
+
+import array
+
+from ucca import core, layer0, layer1
+
+
+class CompiledPassage:
+    """Immutable, array-based view of a :class:core.Passage.
+
+    The view is a snapshot: it doesn't change when the Passage is modified.
+
+    Attributes:
+        passage: the compiled :class:core.Passage
+        tags: a tuple of all interned tags (at compile time), indexed by
+            their codes
+
+    """
+
+    def __init__(self, passage):
+        """Compiles the given Passage.
+
+        Args:
+            passage: the :class:core.Passage to compile
+
+        """
+        self.passage = passage
+        self._nodes = tuple(node for layer in passage.layers
+                            for node in layer.all)
+        self._index = {node.ID: i for i, node in enumerate(self._nodes)}
+        self._layers = {}
+        self._heads = {}
+        start = 0
+        for layer in passage.layers:
+            self._layers[layer.ID] = range(start, start + len(layer.all))
+            self._heads[layer.ID] = memoryview(
+                array.array('i', [self._index[x.ID] for x in layer.heads]))
+            start += len(layer.all)
+
+        node_tags = array.array('i')
+        child_offsets = array.array('i', [0])
+        edge_parents = array.array('i')
+        edge_children = array.array('i')
+        edge_tags = array.array('i')
+        remotes = array.array('b')
+        edge_index = {}  # by the id() of the Edge objects
+        for i, node in enumerate(self._nodes):
+            node_tags.append(core.tag_code(node._tag))
+            for edge in node._outgoing:
+                edge_index[id(edge)] = len(edge_children)
+                edge_parents.append(i)
+                edge_children.append(self._index[edge.child.ID])
+                edge_tags.append(core.tag_code(edge._tag))
+                remotes.append(edge.attrib.flag(core.REMOTE_FLAG))
+            child_offsets.append(len(edge_children))
+
+        parent_offsets = array.array('i', [0])
+        parent_edges = array.array('i')
+        for i, node in enumerate(self._nodes):
+            for edge in node._incoming:
+                parent_edges.append(edge_index[id(edge)])
+            parent_offsets.append(len(parent_edges))
+
+        self.tags = tuple(core._TAGS)
+        self._node_tags = memoryview(node_tags)
+        self._child_offsets = memoryview(child_offsets)
+        self._edge_parents = memoryview(edge_parents)
+        self._edge_children = memoryview(edge_children)
+        self._edge_tags = memoryview(edge_tags)
+        self._remotes = memoryview(remotes)
+        self._parent_offsets = memoryview(parent_offsets)
+        self._parent_edges = memoryview(parent_edges)
+        self._parents = memoryview(array.array(
+            'i', [edge_parents[e] for e in parent_edges]))
+        self._compute_fparents()
+        self._compute_terminals()
+
+    def _compute_fparents(self):
+        """Computes the foundational parent of each Node and scene flags."""
+        fnode = core.tag_code(layer1.NodeTags.Foundational)
+        scene_tags = {core.tag_code(layer1.EdgeTags.Process),
+                      core.tag_code(layer1.EdgeTags.State)}
+        l1range = self._layers.get(layer1.LAYER_ID, range(0))
+        fparents = array.array('i', [-1]) * len(self._nodes)
+        fedges = array.array('i', [-1]) * len(self._nodes)
+        scenes = array.array('b', [0]) * len(self._nodes)
+        for i in l1range:
+            if self._node_tags[i] != fnode:
+                continue
+            if any(self._edge_tags[e] in scene_tags
+                   for e in self.outgoing(i)):
+                scenes[i] = 1
+        for i in range(len(self._nodes)):
+            for e in self.incoming(i):
+                parent = self._edge_parents[e]
+                if (parent in l1range and self._node_tags[parent] == fnode
+                        and not self._remotes[e]):
+                    fparents[i] = parent
+                    fedges[i] = e
+                    break
+        self._fparents = memoryview(fparents)
+        self._fedges = memoryview(fedges)
+        self._scenes = memoryview(scenes)
+
+    def _compute_terminals(self):
+        """Computes the Terminals spanned by each Node (bottom-up)."""
+        positions = array.array('i', [-1]) * len(self._nodes)
+        terminals = {}
+        for i, node in enumerate(self._nodes):
+            if isinstance(node, layer0.Terminal):
+                positions[i] = node.position
+                terminals[i] = [i]
+        # Post-order over non-remote Edges, which never form cycles
+        for root in range(len(self._nodes)):
+            if root in terminals:
+                continue
+            stack = [(root, False)]
+            while stack:
+                i, expanded = stack.pop()
+                if i in terminals:
+                    continue
+                edges = range(self._child_offsets[i],
+                              self._child_offsets[i + 1])
+                if expanded:
+                    terms = []
+                    for e in edges:
+                        if not self._remotes[e]:
+                            terms.extend(terminals[self._edge_children[e]])
+                    terms.sort(key=positions.__getitem__)
+                    terminals[i] = terms
+                    continue
+                stack.append((i, True))
+                for e in edges:
+                    child = self._edge_children[e]
+                    if not self._remotes[e] and child not in terminals:
+                        stack.append((child, False))
+
+        term_offsets = array.array('i', [0])
+        term_indices = array.array('i')
+        starts = array.array('i')
+        ends = array.array('i')
+        for i in range(len(self._nodes)):
+            terms = terminals[i]
+            term_indices.extend(terms)
+            term_offsets.append(len(term_indices))
+            starts.append(positions[terms[0]] if terms else -1)
+            ends.append(positions[terms[-1]] if terms else -1)
+        self._term_offsets = memoryview(term_offsets)
+        self._term_indices = memoryview(term_indices)
+        self._starts = memoryview(starts)
+        self._ends = memoryview(ends)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def index(self, ID):
+        """Returns the index of the Node with the given ID.
+
+        Raises:
+            KeyError: if there is no such Node
+
+        """
+        return self._index[ID]
+
+    def node(self, i):
+        """Returns the :class:core.Node object of index i."""
+        return self._nodes[i]
+
+    def layer(self, ID):
+        """Returns the range of the indices of the Nodes in the given Layer.
+
+        Raises:
+            KeyError: if there is no such Layer
+
+        """
+        return self._layers[ID]
+
+    def heads(self, ID):
+        """Returns the indices of the heads of the given Layer."""
+        return self._heads[ID]
+
+    def code(self, tag):
+        """Returns the code of a tag, or -1 if it was never interned."""
+        return core._TAG_CODES.get(tag, -1)
+
+    def tag(self, i):
+        """Returns the tag of Node i."""
+        return self.tags[self._node_tags[i]]
+
+    def tag_code(self, i):
+        """Returns the tag code of Node i."""
+        return self._node_tags[i]
+
+    def children(self, i):
+        """Returns the indices of the children of Node i, in Edge order."""
+        return self._edge_children[self._child_offsets[i]:
+                                   self._child_offsets[i + 1]]
+
+    def parents(self, i):
+        """Returns the indices of the parents of Node i, in Edge order."""
+        return self._parents[self._parent_offsets[i]:
+                             self._parent_offsets[i + 1]]
+
+    def outgoing(self, i):
+        """Returns the range of the indices of the outgoing Edges of i."""
+        return range(self._child_offsets[i], self._child_offsets[i + 1])
+
+    def incoming(self, i):
+        """Returns the indices of the incoming Edges of Node i."""
+        return self._parent_edges[self._parent_offsets[i]:
+                                  self._parent_offsets[i + 1]]
+
+    def edge_parent(self, e):
+        """Returns the index of the parent Node of Edge e."""
+        return self._edge_parents[e]
+
+    def edge_child(self, e):
+        """Returns the index of the child Node of Edge e."""
+        return self._edge_children[e]
+
+    def edge_tag(self, e):
+        """Returns the tag of Edge e."""
+        return self.tags[self._edge_tags[e]]
+
+    def edge_tag_code(self, e):
+        """Returns the tag code of Edge e."""
+        return self._edge_tags[e]
+
+    def is_remote(self, e):
+        """Returns whether Edge e has a True 'remote' attribute."""
+        return bool(self._remotes[e])
+
+    def fparent(self, i):
+        """Returns the index of the foundational parent of Node i, or -1.
+
+        The foundational parent is as in
+        :attr:layer1.FoundationalNode.fparent: the parent of the first
+        non-remote incoming Edge from a layer 1 FNode.
+
+        """
+        return self._fparents[i]
+
+    def ftag(self, i):
+        """Returns the tag of the Edge from the fparent of Node i, or None."""
+        e = self._fedges[i]
+        return self.tags[self._edge_tags[e]] if e != -1 else None
+
+    def is_scene(self, i):
+        """Returns whether Node i is an FNode with a Process or State."""
+        return bool(self._scenes[i])
+
+    def terminals(self, i):
+        """Returns the indices of the Terminals in the span of Node i.
+
+        Like :meth:layer1.FoundationalNode.get_terminals with the default
+        arguments, the Terminals are reached through non-remote Edges and
+        sorted by position. The span of a Terminal is the Terminal itself.
+
+        """
+        return self._term_indices[self._term_offsets[i]:
+                                  self._term_offsets[i + 1]]
+
+    def start_position(self, i):
+        """Returns the position of the first Terminal of Node i, or -1."""
+        return self._starts[i]
+
+    def end_position(self, i):
+        """Returns the position of the last Terminal of Node i, or -1."""
+        return self._ends[i]
@@ -20,6 +20,10 @@ import xml.etree.ElementTree as ET
 from ucca import core, layer0, layer1, util
 
 
+# A token made only of punctuation marks
+_PUNCT_RE = re.compile('^[{}]+$'.format(string.punctuation))
+
+
 class SiteXMLUnknownElement(core.UCCAError):
     pass
 
@@ -162,22 +166,28 @@ def _from_site_terminals(elem, passage, elem2node):
 
     """
     l0 = layer0.Layer0(passage)
+    words, wrappers, paragraphs = [], [], []
     for para_num, paragraph in enumerate(elem.iterfind(
             SiteCfg.Paths.Paragraphs)):
-        words = list(paragraph.iter(SiteCfg.Tags.Terminal))
-        wrappers = []
-        for word in words:
-            # the list added has only one element, because XML is hierarichal
-            wrappers.extend([x for x in paragraph.iter(SiteCfg.Tags.Unit)
-                             if word in list(x)])
-        for word, wrapper in zip(words, wrappers):
-            punct = (wrapper.get(SiteCfg.Attr.ElemTag) == SiteCfg.Types.Punct)
-            text = SiteUtil.unescape(word.text)
-            # Paragraphs start at 1 and enumeration at 0, so add +1 to para_num
-            t = passage.layer(layer0.LAYER_ID).add_terminal(text, punct,
-                                                            para_num + 1)
-            SiteUtil.set_id(word, t.ID)
-            SiteUtil.set_node(wrapper, t, elem2node)
+        # each word has one wrapper, its parent (as XML is hierarichal)
+        parents = {child: unit for unit in paragraph.iter(SiteCfg.Tags.Unit)
+                   for child in unit}
+        for word in paragraph.iter(SiteCfg.Tags.Terminal):
+            wrapper = parents.get(word)
+            if wrapper is None:  # can't be annotated, so skipped as before
+                continue
+            words.append(word)
+            wrappers.append(wrapper)
+            # Paragraphs start at 1 and enumeration at 0, so add +1
+            paragraphs.append(para_num + 1)
+    terminals = l0.add_terminals(
+        [SiteUtil.unescape(word.text) for word in words],
+        [wrapper.get(SiteCfg.Attr.ElemTag) == SiteCfg.Types.Punct
+         for wrapper in wrappers],
+        paragraphs)
+    for word, wrapper, t in zip(words, wrappers, terminals):
+        SiteUtil.set_id(word, t.ID)
+        SiteUtil.set_node(wrapper, t, elem2node)
 
 
 def _parse_site_units(elem, parent, passage, groups, elem2node):
@@ -338,8 +348,9 @@ def from_site(elem):
     pid = elem.find(SiteCfg.Paths.Main).get(SiteCfg.Attr.PassageID)
     passage = core.Passage(pid)
     elem2node = {}
-    _from_site_terminals(elem, passage, elem2node)
-    _from_site_annotation(elem, passage, elem2node)
+    with passage.bulk():
+        _from_site_terminals(elem, passage, elem2node)
+        _from_site_annotation(elem, passage, elem2node)
     return passage
 
 
@@ -378,9 +389,9 @@ def to_site(passage):
         return elem
 
     def _cunit(node, subelem):
-        uncertain = (SiteCfg.TRUE if node.attrib.get('uncertain')
+        uncertain = (SiteCfg.TRUE if node.attrib.flag(core.UNCERTAIN_FLAG)
                      else SiteCfg.FALSE)
-        suggestion = (SiteCfg.TRUE if node.attrib.get('suggest')
+        suggestion = (SiteCfg.TRUE if node.attrib.flag(core.SUGGEST_FLAG)
                       else SiteCfg.FALSE)
         unanalyzable = (
             SiteCfg.TRUE if len(node) > 1 and all(
@@ -404,9 +415,11 @@ def to_site(passage):
         return elem
 
     def _remote(edge):
-        uncertain = (SiteCfg.TRUE if edge.child.attrib.get('uncertain')
+        uncertain = (SiteCfg.TRUE
+                     if edge.child.attrib.flag(core.UNCERTAIN_FLAG)
                      else SiteCfg.FALSE)
-        suggestion = (SiteCfg.TRUE if edge.child.attrib.get('suggest')
+        suggestion = (SiteCfg.TRUE
+                      if edge.child.attrib.flag(core.SUGGEST_FLAG)
                       else SiteCfg.FALSE)
         elem = ET.Element(SiteCfg.Tags.Remote,
                           {SiteCfg.Attr.ElemTag:
@@ -418,9 +431,10 @@ def to_site(passage):
         state.elems[edge.parent.ID].insert(0, elem)
 
     def _implicit(node):
-        uncertain = (SiteCfg.TRUE if node.incoming[0].attrib.get('uncertain')
+        uncertain = (SiteCfg.TRUE
+                     if node.incoming[0].attrib.flag(core.UNCERTAIN_FLAG)
                      else SiteCfg.FALSE)
-        suggestion = (SiteCfg.TRUE if node.attrib.get('suggest')
+        suggestion = (SiteCfg.TRUE if node.attrib.flag(core.SUGGEST_FLAG)
                       else SiteCfg.FALSE)
         elem = ET.Element(SiteCfg.Tags.Implicit,
                           {SiteCfg.Attr.ElemTag:
@@ -442,7 +456,7 @@ def to_site(passage):
             parent = node.parents[0]
             if parent.tag == layer1.NodeTags.Punctuation:
                 parent = parent.parents[0]
-            if parent in passage.layer(layer1.LAYER_ID).heads:
+            if passage.layer(layer1.LAYER_ID).is_head(parent):
                 parent = None  # the parent is the fake FNodes head
         except IndexError:
             parent = None
@@ -511,16 +525,14 @@ def to_site(passage):
             break
 
     # Handling remotes, implicits and linkages
-    for remote in [edge for node in passage.layer(layer1.LAYER_ID).all
-                   for edge in node
-                   if edge.attrib.get('remote')]:
+    l1 = passage.layer(layer1.LAYER_ID)
+    for remote in l1.remote_edges:
         _remote(remote)
-    for implicit in [node for node in passage.layer(layer1.LAYER_ID).all
-                     if node.attrib.get('implicit')]:
+    for implicit in l1.implicit_nodes:
         _implicit(implicit)
-    for linkage in filter(lambda x: x.tag == layer1.NodeTags.Linkage,
-                          passage.layer(layer1.LAYER_ID).heads):
-        _linkage(linkage)
+    for linkage in l1.nodes_by_tag(layer1.NodeTags.Linkage):
+        if l1.is_head(linkage):
+            _linkage(linkage)
 
     # Creating the XML tree
     root = ET.Element('root', {'schemeVersion': SiteCfg.SchemeVersion})
@@ -617,31 +629,35 @@ def from_standard(root, extra_funcs={}):
                 obj.extra[k] = extra_funcs.get(k, str)(v)
 
     passage = core.Passage(root.get('passageID'), attrib=get_attrib(root))
-    add_extra(passage, root)
-    edge_elems = []
-    for layer_elem in root.findall('layer'):
-        layerID = layer_elem.get('layerID')
-        layer = layer_objs[layerID](passage, attrib=get_attrib(layer_elem))
-        add_extra(layer, layer_elem)
-        # some nodes are created automatically, skip creating them when found
-        # in the XML (they should have 'constant' IDs) but take their edges
-        # and attributes/extra from the XML (may have changed from the defualt)
-        created_nodes = {x.ID: x for x in layer.all}
-        for node_elem in layer_elem.findall('node'):
-            nodeID = node_elem.get('ID')
-            tag = node_elem.get('type')
-            node = (created_nodes[nodeID] if nodeID in created_nodes else
-                    node_objs[tag](root=passage, ID=nodeID, tag=tag,
-                                   attrib=get_attrib(node_elem)))
-            add_extra(node, node_elem)
-            edge_elems.extend((node, x) for x in node_elem.findall('edge'))
-
-    # Adding edges (must have all nodes before doing so)
-    for from_node, edge_elem in edge_elems:
-        to_node = passage.nodes[edge_elem.get('toID')]
-        tag = edge_elem.get('type')
-        edge = from_node.add(tag, to_node, edge_attrib=get_attrib(edge_elem))
-        add_extra(edge, edge_elem)
+    with passage.bulk():
+        add_extra(passage, root)
+        edge_elems = []
+        for layer_elem in root.findall('layer'):
+            layerID = layer_elem.get('layerID')
+            layer = layer_objs[layerID](passage,
+                                        attrib=get_attrib(layer_elem))
+            add_extra(layer, layer_elem)
+            # some nodes are created automatically, skip creating them when
+            # found in the XML (they should have 'constant' IDs) but take
+            # their edges and attributes/extra from the XML (may have changed
+            # from the defualt)
+            created_nodes = {x.ID: x for x in layer.all}
+            for node_elem in layer_elem.findall('node'):
+                nodeID = node_elem.get('ID')
+                tag = node_elem.get('type')
+                node = (created_nodes[nodeID] if nodeID in created_nodes else
+                        node_objs[tag](root=passage, ID=nodeID, tag=tag,
+                                       attrib=get_attrib(node_elem)))
+                add_extra(node, node_elem)
+                edge_elems.extend((node, x) for x in node_elem.findall('edge'))
+
+        # Adding edges (must have all nodes before doing so)
+        for from_node, edge_elem in edge_elems:
+            to_node = passage.nodes[edge_elem.get('toID')]
+            tag = edge_elem.get('type')
+            edge = from_node.add(tag, to_node,
+                                 edge_attrib=get_attrib(edge_elem))
+            add_extra(edge, edge_elem)
 
     return passage
 
@@ -658,13 +674,16 @@ def from_text(text, passage_id='1'):
     """
     p = core.Passage(passage_id)
     l0 = layer0.Layer0(p)
-    punct = re.compile('^[{}]+$'.format(string.punctuation))
-
+    tokens, paragraphs = [], []
     for i, par in enumerate(text):
-        for token in par.split():
-            # i is paragraph index, but it starts with 0, so we need to add +1
-            l0.add_terminal(text=token, punct=punct.match(token),
-                            paragraph=(i + 1))
+        par_tokens = par.split()
+        tokens.extend(par_tokens)
+        # i is paragraph index, but it starts with 0, so add +1
+        paragraphs.extend([i + 1] * len(par_tokens))
+
+    with p.bulk():
+        l0.add_terminals(tokens, [_PUNCT_RE.match(x) for x in tokens],
+                         paragraphs)
     return p
 
 
@@ -8,45 +8,259 @@ are connected between themselves and to Nodes in other layers using
 
 """
 
-import operator
+import array
+import collections
+import contextlib
 import functools
+import hashlib
+import math
+import operator
 
 
 # Max number of digits allowed for a unique ID
 UNIQUE_ID_MAX_DIGITS = 5
 
 
+def _id_key(ID):
+    """Returns the sort key of a :class:Node ID (see :func:id_orderkey).
+
+    Args:
+        ID: the complete ID of the Node (layer ID, separator, unique ID)
+
+    Returns:
+        a tuple of the layer ID and the unique ID, right-aligned to
+        UNIQUE_ID_MAX_DIGITS characters. Comparing such tuples orders first
+        lexicography by the layer ID, then numerically by the unique ID.
+
+    """
+    layer, unique = ID.split(Node.ID_SEPARATOR)
+    return (layer, unique.rjust(UNIQUE_ID_MAX_DIGITS))
+
+
+def _set_slots(obj, state):
+    """Sets the slots of an object from its pickled state.
+
+    Objects with __slots__ are pickled with a (None, slots) state. Objects
+    pickled before __slots__ were used have their __dict__ as the state,
+    where the 'extra' dictionary is now kept in the '_extra' slot (None if
+    empty); slots added since are set by the caller.
+
+    Returns:
+        True iff the state was pickled before __slots__ were used.
+
+    """
+    old = isinstance(state, dict)
+    if old:
+        state = dict(state)
+        if 'extra' in state:
+            state['_extra'] = state.pop('extra') or None
+    else:
+        state = state[1]
+    for key, value in state.items():
+        setattr(obj, key, value)
+    return old
+
+
 # Used as the default ordering key function for ordered objects, namely
 # :class:Layer and :class:Node .
 def id_orderkey(node):
     """Key function which sorts by layer (string), then by unique ID (int).
 
+    The key is computed once, when the Node is created, so using this
+    function for sorting involves no formatting or parsing of IDs.
+
     Args:
         node: :class:Node which we will to sort according to its ID
 
     Returns:
-        a string with the layer and unique ID in such a way that sort will
+        a tuple with the layer and unique ID in such a way that sort will
         first order lexicography the layer ID then numerically the unique ID.
 
     """
-    layer, unique = node.ID.split(Node.ID_SEPARATOR)
-    return "{} {:>{}}".format(layer, unique, UNIQUE_ID_MAX_DIGITS)
+    return node._idkey
 
 
 def edge_id_orderkey(edge):
     """Key function which sorts Edges by its IDs (using :func:id_orderkey).
 
+    Like :func:id_orderkey, the key is computed once, when the Edge is
+    created.
+
     Args:
         edge: :class:Edge which we wish to sort according to the ID of its
         parent and children after using :func:id_orderkey.
 
     Returns:
-        a string with the layer and unique ID in such a way that sort will
+        a tuple of the parent and child keys in such a way that sort will
         first order lexicography the layer ID then numerically the unique ID.
 
     """
-    return Edge.ID_FORMAT.format(id_orderkey(edge.parent),
-                                 id_orderkey(edge.child))
+    return edge._idkey
+
+
+# Interned Node and Edge tags: the code of each tag, and the tag of each code.
+# Codes are small ints given in order of first use, and the layer modules
+# intern their tags when imported, so these have the same codes in every
+# process. Other tags are interned when their codes are first asked for.
+_TAG_CODES = {}
+_TAGS = []
+
+
+def tag_code(tag):
+    """Returns the integer code of the tag, interning it if needed."""
+    code = _TAG_CODES.get(tag)
+    if code is None:
+        code = _TAG_CODES[tag] = len(_TAGS)
+        _TAGS.append(tag)
+    return code
+
+
+def code_tag(code):
+    """Returns the tag of an integer code given by :func:tag_code.
+
+    Raises:
+        IndexError: if no tag has this code
+
+    """
+    return _TAGS[code]
+
+
+def intern_tags(tags_class):
+    """Interns the tags defined as attributes of a tags class, in order."""
+    for name, tag in vars(tags_class).items():
+        if not name.startswith('_') and isinstance(tag, str):
+            tag_code(tag)
+
+
+def _canonical(value):
+    """Returns a canonical string of a tag or attribute value for digests.
+
+    Values which are equal have the same canonical string (so 1, 1.0 and
+    True are all the same). Values which are neither strings nor numbers
+    are represented by their repr().
+
+    """
+    if isinstance(value, str):
+        return 's' + value
+    if isinstance(value, float) and not (math.isfinite(value) and
+                                         value.is_integer()):
+        return 'n' + repr(value)  # int() fails on NaN and infinity
+    if isinstance(value, (bool, int, float)):
+        return 'n' + str(int(value))
+    return 'r' + repr(value)
+
+
+def _digest(*parts):
+    """Returns a stable hex digest of parts (strings and lists of strings)."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _match_unordered(items1, items2, fingerprint, equal):
+    """Returns whether the items can be paired one-to-one as equal.
+
+    Items are only compared with items of the same fingerprint, and as
+    equality is assumed to be an equivalence relation, the first equal item
+    found is taken (no need to try other pairings).
+
+    Args:
+        items1, items2: sequences of items to match
+        fingerprint: key function, equal items must have the same key
+        equal: function of two items, returns whether they are equal
+
+    """
+    if len(items1) != len(items2):
+        return False
+    candidates = collections.defaultdict(list)
+    for item in items2:
+        candidates[fingerprint(item)].append(item)
+    for item in items1:
+        bucket = candidates[fingerprint(item)]
+        for i, other in enumerate(bucket):
+            if equal(item, other):
+                del bucket[i]
+                break
+        else:
+            return False
+    return True
+
+
+def _iter_preorder(roots, children, depth, breadth_first, duplicates):
+    """Iterates a DAG in breadth-first or depth-first (pre-order) manner.
+
+    Args:
+        roots: the objects to start the iteration from, in order
+        children: function which returns a list of the children of an object
+        depth: the depth of the roots
+        breadth_first: whether to iterate breadth-first or depth-first
+        duplicates: whether to return objects which were already returned
+            when they are encountered again. Note that an object is checked
+            when it is added to the waiting objects, hence an object waiting
+            twice will be returned twice.
+
+    Yields:
+        (depth, object) tuples
+
+    """
+    processed = set()
+    if breadth_first:
+        waiting = collections.deque((depth, x) for x in roots)
+        pop = waiting.popleft
+    else:  # a stack, whose top is the end of the list
+        waiting = [(depth, x) for x in reversed(roots)]
+        pop = waiting.pop
+    while waiting:
+        curr_depth, curr = pop()
+        yield curr_depth, curr
+        processed.add(curr)
+        to_add = [(curr_depth + 1, x) for x in children(curr)
+                  if duplicates or x not in processed]
+        waiting.extend(to_add if breadth_first else reversed(to_add))
+
+
+def _iter_postorder(roots, children, depth, duplicates):
+    """Iterates a DAG in depth-first post-order manner.
+
+    Each object is returned only after all the objects in its subtree were.
+
+    Args:
+        see :func:_iter_preorder. Objects are checked when they are first
+            encountered, hence each object is returned at most once unless
+            duplicates is True.
+
+    Yields:
+        (depth, object) tuples
+
+    """
+    entered = set()
+    # Each entry is (depth, object, iterator of the children not yet visited)
+    # where the bottom entry is of the roots, and is never returned
+    stack = [(depth - 1, None, iter(roots))]
+    while stack:
+        curr_depth, curr, pending = stack[-1]
+        for child in pending:
+            if duplicates or child not in entered:
+                entered.add(child)
+                stack.append((curr_depth + 1, child, iter(children(child))))
+                break
+        else:
+            stack.pop()
+            if stack:
+                yield curr_depth, curr
+
+
+# Mutation events, delivered to the subscribers of a Passage (see
+# Passage.subscribe) after the change was done. When an attribute is set or
+# deleted, the element is the Passage, Layer, Node or Edge whose attributes
+# changed, and the old/new value is NO_VALUE if the key wasn't/isn't set.
+NodeAdded = collections.namedtuple('NodeAdded', ['node'])
+NodeRemoved = collections.namedtuple('NodeRemoved', ['node'])
+EdgeAdded = collections.namedtuple('EdgeAdded', ['edge'])
+EdgeRemoved = collections.namedtuple('EdgeRemoved', ['edge'])
+NodeTagChanged = collections.namedtuple('NodeTagChanged', ['node', 'old_tag'])
+EdgeTagChanged = collections.namedtuple('EdgeTagChanged', ['edge', 'old_tag'])
+AttributeChanged = collections.namedtuple(
+    'AttributeChanged', ['element', 'key', 'old_value', 'new_value'])
+NO_VALUE = object()
 
 
 class UCCAError(Exception):
@@ -80,7 +294,7 @@ class UnimplementedMethodError(UCCAError):
     pass
 
 
-class ModifyPassage:
+def ModifyPassage(fn):
     """Decorator for changing a :class:Passage or any member of it.
 
     This decorator is mandatory for anything which causes the elements in
@@ -88,6 +302,9 @@ class ModifyPassage:
     an attribute.
 
     It validates that the Passage is not frozen before allowing the change.
+    The check is made by a plain function wrapping fn, which is created once
+    when the method is defined, so each call only adds the wrapper call and
+    an attribute lookup.
 
     The decorator can't be used for __init__ calls, as at the stage of the
     check there are no instance attributes to check. So in such cases,
@@ -95,41 +312,36 @@ class ModifyPassage:
     decorated instead (and should be called after the instance attributes
     are set).
 
-    Attributes:
-        fn: the function object to decorate
-
-    """
-
-    def __init__(self, fn):
-        self.fn = fn
-
-    def __get__(self, obj, cls):
-        """Used to bind the function to the instance (add 'self')."""
-        return functools.partial(self.__call__, obj)
-
-    def __call__(self, *args, **kwargs):
-        """Decorating functions which modify :class:Passage elements.
+    Args:
+        fn: the method to decorate. Its object must have a _root attribute
+            with the Passage it is part of (the Passage itself for its
+            own methods).
 
-        Args:
-            args: list of all arguments, assuming the first is the object
-                which modifies :class:Passage, and it has an attribute root
-                which points to the Passage it is part of.
-            kwargs: list of all keyword arguments
+    Returns:
+        the decorated method, which raises FrozenPassageError if the
+        :class:Passage is frozen and can't be modified.
 
-        Returns:
-            The decorated function result.
+    """
+    @functools.wraps(fn)
+    def modify(self, *args, **kwargs):
+        if self._root._frozen:
+            raise FrozenPassageError()
+        return fn(self, *args, **kwargs)
+    return modify
 
-        Raises:
-            FrozenPassageError: if the :class:Passage is frozen and can't be
-                modified.
 
-        """
-        @functools.wraps(self.fn)
-        def decorated(*args, **kwargs):
-            if args[0].root.frozen:
-                raise FrozenPassageError()
-            return self.fn(*args, **kwargs)
-        return decorated(*args, **kwargs)
+# Attribute keys whose boolean values are kept as bits of an int rather
+# than in a dict, as nearly all attributes of Nodes and Edges are such. Each
+# key has two bits: whether it's set as a flag, and its truth value (also
+# for other values, kept in the dict). So whether an attribute is true can
+# be tested with e.g. ``element.attrib.flag(REMOTE_FLAG)``.
+FLAG_KEYS = ('remote', 'implicit', 'uncertain', 'suggest')
+_FLAG_BITS = {key: (1 << (2 * i), 1 << (2 * i + 1))
+              for i, key in enumerate(FLAG_KEYS)}
+REMOTE_FLAG = _FLAG_BITS['remote'][1]
+IMPLICIT_FLAG = _FLAG_BITS['implicit'][1]
+UNCERTAIN_FLAG = _FLAG_BITS['uncertain'][1]
+SUGGEST_FLAG = _FLAG_BITS['suggest'][1]
 
 
 class _AttributeDict:
@@ -140,21 +352,68 @@ class _AttributeDict:
     dictionary is adhering to :class:Passage frozen status and modification
     decorators.
 
+    Boolean values of the keys in FLAG_KEYS are kept as bits of an int
+    (see REMOTE_FLAG etc.), and other attributes in a dictionary. As most
+    elements have no other attributes, the dictionary is only allocated when
+    the first one is set.
+
     Attributes:
         root: the Passage this object is linked with
+        owner: the element whose attributes these are, reported in
+            :class:AttributeChanged events
 
     """
 
-    def __init__(self, root, mapping=None):
+    __slots__ = ('_root', '_dict', '_flags', '_owner')
+
+    def __init__(self, root, mapping=None, owner=None):
         self._root = root
-        self._dict = mapping.copy() if mapping is not None else dict()
+        self._dict = None
+        self._flags = 0
+        self._owner = owner
+        if isinstance(mapping, _AttributeDict):
+            self._flags = mapping._flags
+            self._dict = mapping._dict.copy() if mapping._dict else None
+        elif mapping:
+            for key, value in mapping.items():
+                self._set(key, value)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):  # pickled before __slots__ were used
+            # The owner is set by Passage.__setstate__
+            self.__init__(state['_root'], state['_dict'])
+        else:
+            _set_slots(self, state)
 
     def __getitem__(self, key):
+        bits = _FLAG_BITS.get(key)
+        if bits is not None and self._flags & bits[0]:
+            return bool(self._flags & bits[1])
+        if self._dict is None:
+            raise KeyError(key)
         return self._dict[key]
 
     def get(self, key, default=None):
+        bits = _FLAG_BITS.get(key)
+        if bits is not None and self._flags & bits[0]:
+            return bool(self._flags & bits[1])
+        if self._dict is None:
+            return default
         return self._dict.get(key, default)
 
+    def flag(self, bit):
+        """Returns whether an attribute kept as a flag is true.
+
+        Args:
+            bit: the value bit of the attribute, e.g. REMOTE_FLAG
+
+        Returns:
+            True iff the attribute is set to a true value, without looking
+            up the key.
+
+        """
+        return bool(self._flags & bit)
+
     def equals(self, other):
         """True iff the two objects are equal (only dicts, w.o.r.t Passage).
 
@@ -165,28 +424,86 @@ class _AttributeDict:
             True iff the dictionaries contains are equal.
 
         """
-        return self._dict == other._dict
+        if self._flags == other._flags and self._dict == other._dict:
+            return True
+        return self.copy() == other.copy()
+
+    def _canonical(self):
+        """Returns the attributes as a sorted list of canonical strings."""
+        return sorted(_canonical(k) + '=' + _canonical(v)
+                      for k, v in self.items())
 
     @property
     def root(self):
         return self._root
 
+    @property
+    def owner(self):
+        return self._owner
+
     def copy(self):
-        return self._dict.copy()
+        return dict(self.items())
+
+    def _set(self, key, value):
+        """Sets the value, as a flag if possible, without any checks."""
+        bits = _FLAG_BITS.get(key)
+        if bits is not None:
+            # Other values are kept in the dictionary, but the value bit
+            # is still their truth value, so flags can always be tested
+            self._flags &= ~(bits[0] | bits[1])
+            self._flags |= bits[1] if value else 0
+            if type(value) is bool:
+                self._flags |= bits[0]
+                self._pop(key, None)
+                return
+        if self._dict is None:
+            self._dict = {}
+        self._dict[key] = value
+
+    def _pop(self, key, *default):
+        """Removes the key from the dictionary, allocated only if not empty."""
+        if self._dict is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self._dict.pop(key, *default)
+        if not self._dict:
+            self._dict = None
+        return value
 
     @ModifyPassage
     def __setitem__(self, key, value):
-        self._dict[key] = value
+        old_value = self.get(key, NO_VALUE)
+        self._set(key, value)
+        self._root._change_attribute(self._owner, key, old_value, value)
 
     @ModifyPassage
     def __delitem__(self, key):
-        del self._dict[key]
+        bits = _FLAG_BITS.get(key)
+        if bits is not None and self._flags & bits[0]:
+            old_value = bool(self._flags & bits[1])
+        else:
+            old_value = self._pop(key)
+        if bits is not None:
+            self._flags &= ~(bits[0] | bits[1])
+        self._root._change_attribute(self._owner, key, old_value, NO_VALUE)
 
     def __len__(self):
-        return len(self._dict)
+        length = len(self._dict) if self._dict is not None else 0
+        if self._flags:
+            length += sum(1 for bits in _FLAG_BITS.values()
+                          if self._flags & bits[0])
+        return length
 
     def items(self):
-        return self._dict.items()
+        items = []
+        if self._flags:
+            items = [(key, bool(self._flags & bits[1]))
+                     for key, bits in _FLAG_BITS.items()
+                     if self._flags & bits[0]]
+        if self._dict is not None:
+            items.extend(self._dict.items())
+        return items
 
 
 class Edge:
@@ -201,10 +518,14 @@ class Edge:
         ID: ID of the Edge, constructed from the IDs of the two Nodes
         root: the Passage this object is linked with
         attrib: attribute dictionary of the Edge
-        extra: temporary storage space for undocumented attribues and data
+        extra: temporary storage space for undocumented attribues and data,
+            allocated on first use
         tag: the string label of the Edge
+        tag_code: the integer code of the tag (see :func:tag_code)
         parent: the originating Node of the Edge
         child: the target Node of the Edge
+        fingerprint: a digest of the tag, attributes and child fingerprint,
+            equal for Edge-equal Edges (see :meth:Node.fingerprint)
         ID_FORMAT: format string which creates the ID of the Edge from
             the IDs of the parent (first argument to the formattinf string)
             and the child (second argument).
@@ -213,6 +534,10 @@ class Edge:
 
     ID_FORMAT = "{}->{}"
 
+    # Passages may hold many thousands of Edges, so avoid a __dict__ for each
+    __slots__ = ('_tag', '_root', '_parent', '_child', '_idkey', '_attrib',
+                 '_extra', '_fingerprint')
+
     def __init__(self, root, tag, parent, child, attrib=None):
         """Creates a new :class:Edge object.
 
@@ -224,14 +549,22 @@ class Edge:
                 is frozen and can't be modified.
 
         """
-        if root.frozen:
+        if root._frozen:
             raise FrozenPassageError()
         self._tag = tag
         self._root = root
         self._parent = parent
         self._child = child
-        self._attrib = _AttributeDict(root, attrib)
-        self.extra = {}
+        self._idkey = (parent._idkey, child._idkey)
+        self._attrib = _AttributeDict(root, attrib, self)
+        self._extra = None
+        self._fingerprint = None  # (Passage version, digest) when computed
+
+    def __setstate__(self, state):
+        if _set_slots(self, state):
+            # The Nodes may not be unpickled yet, so the ID key and owner
+            # are set by Passage.__setstate__
+            self._fingerprint = None
 
     @property
     def tag(self):
@@ -242,8 +575,13 @@ class Edge:
     def tag(self, new_tag):
         old_tag = self._tag
         self._tag = new_tag
+        self._parent._by_tag = None  # re-indexed in the order of the Edges
         self._root._change_edge_tag(self, old_tag)
 
+    @property
+    def tag_code(self):
+        return tag_code(self._tag)
+
     @property
     def root(self):
         return self._root
@@ -260,10 +598,29 @@ class Edge:
     def attrib(self):
         return self._attrib
 
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+
     @property
     def ID(self):
         return Edge.ID_FORMAT.format(self._parent.ID, self._child.ID)
 
+    @property
+    def fingerprint(self):
+        version = self._root._version
+        if self._fingerprint is None or self._fingerprint[0] != version:
+            self._fingerprint = (version, _digest(
+                _canonical(self._tag), self._attrib._canonical(),
+                self._child.fingerprint))
+        return self._fingerprint[1]
+
     def equals(self, other, *, recursive=True, ordered=False):
         """Returns whether self and other are Edge-equals.
 
@@ -300,14 +657,21 @@ class Node:
             a separator, and a unique alphanumeric ID in the layer.
         root: the Passage this object is linked with
         attrib: attribute dictionary of the Node
-        extra: temporary storage space for undocumented attribues and data
+        extra: temporary storage space for undocumented attribues and data,
+            allocated on first use
         tag: the string label of the Node
+        tag_code: the integer code of the tag (see :func:tag_code)
         layer: the Layer this Node belongs to
         incoming: a copy of the incoming Edges to this object
         outgoing: a copy of the outgoing Edges from this object
         parents: the Nodes which have incoming Edges to this object
         children: the Nodes which have outgoing Edges from this object
         orderkey: the key function for ordering the outgoing Edges
+        fingerprint: a digest of the tag, attributes and the (unordered)
+            fingerprints of the outgoing Edges, computed bottom-up and
+            cached until the Passage changes. Node-equal Nodes (of the same
+            class) have the same fingerprint, so it can be used to find
+            candidates for equality; different Nodes may rarely collide.
         ID_SEPARATOR: separator function between the Layer ID and the unique
             Node ID in the complete ID of the Node. Mustn't be alphanumeric.
 
@@ -315,6 +679,12 @@ class Node:
 
     ID_SEPARATOR = '.'
 
+    # Passages may hold many thousands of Nodes, so avoid a __dict__ for each.
+    # Subclasses should define __slots__ as well (empty if no new fields).
+    __slots__ = ('_tag', '_root', '_ID', '_idkey', '_attrib', '_extra',
+                 '_outgoing', '_incoming', '_by_tag', '_orderkey',
+                 '_fingerprint')
+
     def __init__(self, ID, root, tag, attrib=None, *,
                  orderkey=edge_id_orderkey):
         """Creates a new :class:Node object.
@@ -327,20 +697,32 @@ class Node:
                 is frozen and can't be modified.
 
         """
-        if root.frozen:
+        if root._frozen:
             raise FrozenPassageError()
         self._tag = tag
         self._root = root
         self._ID = ID
-        self._attrib = _AttributeDict(root, attrib)
-        self.extra = {}
+        self._idkey = _id_key(ID)
+        self._attrib = _AttributeDict(root, attrib, self)
+        self._extra = None
         self._outgoing = []
         self._incoming = []
+        # Edge tag: outgoing Edges with it (ordered), built on the first
+        # lookup (see _edges_by_tag), so None for most leaves
+        self._by_tag = None
         self._orderkey = orderkey
+        self._fingerprint = None  # (Passage version, digest) when computed
 
         # After properly initializing self, add it to the Passage/Layer
         root._add_node(self)
-        root.layer(self.layer.ID)._add_node(self)
+
+    def __setstate__(self, state):
+        if _set_slots(self, state):
+            # Subclasses' slots are set when their Layers are refreshed
+            # (see Passage.__setstate__)
+            self._idkey = _id_key(self._ID)
+            self._by_tag = None
+            self._fingerprint = None
 
     @property
     def tag(self):
@@ -353,6 +735,10 @@ class Node:
         self._tag = new_tag
         self._root._change_node_tag(self, old_tag)
 
+    @property
+    def tag_code(self):
+        return tag_code(self._tag)
+
     @property
     def root(self):
         return self._root
@@ -365,10 +751,36 @@ class Node:
     def attrib(self):
         return self._attrib
 
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+
     @property
     def layer(self):
         return self._root.layer(self._ID.split(Node.ID_SEPARATOR)[0])
 
+    @property
+    def fingerprint(self):
+        version = self._root._version
+        if self._fingerprint is None or self._fingerprint[0] != version:
+            # Bottom-up, so the children are up to date when a Node is digested
+            for node in self.iter(method='postorder'):
+                if (node._fingerprint is None or
+                        node._fingerprint[0] != version):
+                    node._fingerprint = (version, node._digest())
+        return self._fingerprint[1]
+
+    def _digest(self):
+        """Returns the digest of self, given that its children are digested."""
+        return _digest(_canonical(self._tag), self._attrib._canonical(),
+                       sorted(edge.fingerprint for edge in self._outgoing))
+
     @property
     def incoming(self):
         return tuple(self._incoming)
@@ -415,13 +827,92 @@ class Node:
         """
         edge = Edge(root=self._root, tag=edge_tag, parent=self,
                     child=node, attrib=edge_attrib)
-        self._outgoing.append(edge)
-        self._outgoing.sort(key=self._orderkey)
-        node._incoming.append(edge)
-        node._incoming.sort(key=node._orderkey)
-        self.root._add_edge(edge)
+        self._link(edge)
         return edge
 
+    def _link(self, edge, positions=None):
+        """Links an :class:Edge from self (new or removed) to the graph.
+
+        Args:
+            edge: the Edge to link
+            positions: (index in self's outgoing Edges, index in the child's
+                incoming Edges) to insert the Edge at, for putting a removed
+                Edge back where it was. If None, it is appended.
+
+        """
+        child = edge.child
+        if positions is None:
+            self._outgoing.append(edge)
+            child._incoming.append(edge)
+        else:
+            self._outgoing.insert(positions[0], edge)
+            child._incoming.insert(positions[1], edge)
+        if self._root._bulk or positions is not None:
+            # already in order if put back, otherwise ordered when bulk ends
+            self._by_tag = None  # re-indexed in the order of the Edges
+        else:
+            self._index_edge(edge)
+            self._outgoing.sort(key=self._orderkey)
+            child._incoming.sort(key=child._orderkey)
+        self._root._add_edge(edge)
+
+    def _edges_by_tag(self):
+        """Returns the outgoing Edges of self by their tags (ordered).
+
+        The index is built on the first call and then kept up to date, until
+        the order of the Edges changes in other ways than adding and
+        removing them one by one.
+
+        """
+        by_tag = self._by_tag
+        if by_tag is None:
+            by_tag = {}
+            for edge in self._outgoing:
+                by_tag.setdefault(edge.tag, []).append(edge)
+            if by_tag and not self._root._bulk:
+                self._by_tag = by_tag
+        return by_tag
+
+    def _index_edge(self, edge):
+        """Adds an outgoing :class:Edge to the Edges with its tag."""
+        if self._by_tag is not None:
+            edges = self._by_tag.setdefault(edge.tag, [])
+            edges.append(edge)
+            edges.sort(key=self._orderkey)
+
+    def _unindex_edge(self, edge):
+        """Removes an outgoing :class:Edge from the Edges with its tag."""
+        if self._by_tag is not None:
+            edges = self._by_tag[edge.tag]
+            edges.remove(edge)
+            if not edges:
+                del self._by_tag[edge.tag]
+                if not self._by_tag:
+                    self._by_tag = None
+
+    def _sort_edges(self):
+        """Orders the Edges of self by their order keys."""
+        self._outgoing.sort(key=self._orderkey)
+        self._incoming.sort(key=self._orderkey)
+        self._by_tag = None  # re-indexed in the new order
+
+    def _unlink(self, edge):
+        """Unlinks an :class:Edge from self from the graph.
+
+        Raises:
+            MissingNodeError: if the Edge is not linked.
+
+        """
+        try:
+            positions = (self._outgoing.index(edge),
+                         edge.child._incoming.index(edge))
+        except ValueError:
+            raise MissingNodeError()
+        del self._outgoing[positions[0]]
+        del edge.child._incoming[positions[1]]
+        self._unindex_edge(edge)
+        self._root._remove_edge(edge, positions)
+
     @ModifyPassage
     def remove(self, edge_or_node):
         """Removes the :class:Edge between self and a child :class:Node.
@@ -438,21 +929,15 @@ class Node:
             MissingNodeError: if the Node or Edge is not connected with self.
 
         """
-        if edge_or_node not in self._outgoing:  # a Node, or an error
+        if isinstance(edge_or_node, Edge) and edge_or_node.parent is self:
+            edge = edge_or_node
+        else:  # a Node (found by its incoming Edges), or an error
             try:
-                edge = [edge for edge in self._outgoing
-                        if edge.child == edge_or_node][0]
-            except IndexError:
+                edge = next(edge for edge in edge_or_node._incoming
+                            if edge.parent is self)
+            except (AttributeError, StopIteration):
                 raise MissingNodeError()
-        else:  # an Edge object
-            edge = edge_or_node
-
-        try:
-            self._outgoing.remove(edge)
-            edge.child._incoming.remove(edge)
-            self.root._remove_edge(edge)
-        except ValueError:
-            raise MissingNodeError()
+        self._unlink(edge)
 
     @property
     def orderkey(self):
@@ -462,6 +947,8 @@ class Node:
     def orderkey(self, value):
         self._orderkey = value
         self._outgoing.sort(key=value)
+        self._by_tag = None  # re-indexed in the new order
+        self.layer._indexes = None
 
     @ModifyPassage
     def destroy(self):
@@ -476,7 +963,6 @@ class Node:
             self.remove(edge)
         for edge in self.incoming:
             edge.parent.remove(edge)
-        self.layer._remove_node(self)
         self._root._remove_node(self)
 
     def equals(self, other, *, recursive=True, ordered=False):
@@ -506,31 +992,29 @@ class Node:
             return True
         if len(self) != len(other):
             return False  # not necessary, but gives better performance
+        if type(self) is type(other) and self.fingerprint != other.fingerprint:
+            return False  # equal Nodes must have the same fingerprint
         if ordered:
             return all(e1.equals(e2, recursive=True, ordered=True)
                        for e1, e2 in zip(self, other))
         # For unordered equality, I try to find & remove an equivalent
-        # Edge + Node couple from other's Edges until exhausted.
-        # Because both Edge-equality and Node-equiality are equivalence
-        # classes, I can just take the first I found and remove it w/o
-        # trying to iterate through possible orders.
-        edges = list(other)
-        try:
-            for e1 in self:
-                edges.remove([e2 for e2 in edges
-                              if e1.equals(e2, recursive=True)][0])
-        except IndexError:
-            return False
-        return True
-
-    def iter(self, obj="nodes", method="dfs", duplicates=False, key=None):
+        # Edge + Node couple from other's Edges until exhausted, looking only
+        # at Edges with the same fingerprint.
+        return _match_unordered(self._outgoing, other._outgoing,
+                                operator.attrgetter('fingerprint'),
+                                lambda e1, e2: e1.equals(e2, recursive=True))
+
+    def iter(self, obj="nodes", method="dfs", duplicates=False, key=None, *,
+             depth=False):
         """Iterates the :class:Node objects in the subtree of self.
 
         Args:
             obj: yield Node objects (use value "nodes", default) or Edge
                 objects (use values "edges")
-            method: do breadth-first iteration (use value "bfs") or depth-dirst
-                iteration (value "dfs", default).
+            method: do breadth-first iteration (use value "bfs"), depth-dirst
+                pre-order iteration (value "dfs", default) or depth-first
+                post-order iteration (value "postorder"), where each object
+                is yielded after all objects in its subtree.
             duplicates: If True, may return the same object twice if it is
                 encountered twice, because of the DAG structure which isn't
                 necessarily a tree. If it is False, all objects will be yielded
@@ -539,32 +1023,34 @@ class Node:
                 takes one argument (the item) and returns True if it should be
                 returned to the user. If an item isn't returned, its subtree
                 is still iterated.  Defaults to None (returns all items).
+            depth: if True, yield (depth, item) tuples, where depth is the
+                number of Edges from self to the Node (self is of depth 0),
+                or to the child of the Edge. Defaults to False.
 
         Yields:
             a :class:Node or :class:Edge object according to the iteration
             parameters.
 
         """
-        if method not in ("dfs", "bfs"):
-            raise ValueError("method can be either 'dfs' or 'bfs'")
+        if method not in ("dfs", "bfs", "postorder"):
+            raise ValueError("method can be either 'dfs', 'bfs' or "
+                             "'postorder'")
         if obj not in ("nodes", "edges"):
             raise ValueError("obj can be either 'nodes' or 'edges'")
-        processed = set()
         if obj == 'nodes':
-            waiting = [self]
+            roots, root_depth = [self], 0
+            children = lambda node: [edge.child for edge in node._outgoing]
         else:
-            waiting = self._outgoing[:]
-        while len(waiting):
-            curr = waiting.pop(0)
-            if key is None or key(curr):
-                yield curr
-            processed.add(curr)
-            to_add = curr.children if obj == 'nodes' else list(curr.child)
-            to_add = [x for x in to_add if duplicates or x not in processed]
-            if method == "bfs":
-                waiting.extend(to_add)
-            else:
-                waiting = to_add + waiting
+            roots, root_depth = self._outgoing[:], 1
+            children = lambda edge: edge.child._outgoing[:]
+        if method == "postorder":
+            items = _iter_postorder(roots, children, root_depth, duplicates)
+        else:
+            items = _iter_preorder(roots, children, root_depth,
+                                   method == "bfs", duplicates)
+        for item_depth, item in items:
+            if key is None or key(item):
+                yield (item_depth, item) if depth else item
 
 
 class Layer:
@@ -580,6 +1066,8 @@ class Layer:
         root: the Passage this object is linked with
         attrib: attribute dictionary of the Layer
         extra: temporary storage space for undocumented attribues and data
+        fingerprint: a digest of the attributes and the (unordered)
+            fingerprints of the heads, equal for Layer-equal Layers
         orderkey: the key function for ordering the Nodes in the layer.
             Note that it must rely only on the Nodes and/or Edges in the Layer.
             If it, for example, rely on Edges added between Nodes in the Layer
@@ -587,8 +1075,21 @@ class Layer:
             the order will not be updated (because the Layer object won't know
             that something has changed).
         all: a list of all the Nodes which are part of this Layer
-        heads: a list of all Nodes which have no incoming Edges in the subgraph
-            of the Layer (can have Edges from Nodes in other Layers).
+        heads: a tuple of all Nodes which have no incoming Edges in the
+            subgraph of the Layer (can have Edges from Nodes in other Layers).
+            It isn't copied on each access, use list() for a modifiable copy.
+        remote_edges: a list of the Edges from Nodes in the Layer which have
+            a True 'remote' attribute
+        implicit_nodes: a list of the Nodes in the Layer which have a True
+            'implicit' attribute
+
+    The Nodes by tag, the Edges from them by tag, and the remote Edges and
+    implicit Nodes are indexed in one pass on the first such query after
+    the Layer has changed (see :meth:nodes_by_tag and :meth:edges_by_tag),
+    so further queries take time proportional to the size of the result.
+    Only changes to the Layer itself (its Nodes and the Edges from them)
+    drop the indexes; changes to other Layers don't. In bulk mode the
+    indexes are built for each query.
 
     """
 
@@ -603,15 +1104,29 @@ class Layer:
                 is frozen and can't be modified.
 
         """
-        if root.frozen:
+        if root._frozen:
             raise FrozenPassageError()
         self._ID = ID
         self._root = root
-        self._attrib = _AttributeDict(root, attrib)
+        self._attrib = _AttributeDict(root, attrib, self)
         self.extra = {}
         self._all = []
-        self._heads = []
+        # The number of incoming Edges from Nodes in the Layer, for each Node
+        # in the Layer, and the Nodes without such Edges (unordered). Both
+        # are keyed by the id() of the Node, as Node subclasses may define
+        # hashing which is costly, and identity is what we need.
+        self._indegree = {}
+        self._heads = {}
+        self._ordered_heads = ()  # None if not computed since heads changed
+        self._sorted = True
+        # (Nodes by tag, Edges by tag, remote Edges, implicit Nodes), all in
+        # order, built on the first query and dropped when the Layer changes
+        self._indexes = None
         self._orderkey = orderkey
+        self._fingerprint = None  # (Passage version, digest) when computed
+        # Derived values computed since the Passage was frozen (see
+        # :meth:_frozen_value), None when the Passage isn't frozen
+        self._frozen_values = None
         root._add_layer(self)
 
     @property
@@ -628,11 +1143,13 @@ class Layer:
 
     @property
     def all(self):
+        self._sort()
         return self._all[:]
 
     @property
     def heads(self):
-        return self._heads[:]
+        self._sort()
+        return self._ordered_heads
 
     @property
     def orderkey(self):
@@ -641,8 +1158,126 @@ class Layer:
     @orderkey.setter
     def orderkey(self, value):
         self._orderkey = value
-        self._all.sort(key=value)
-        self._heads.sort(key=value)
+        self._sorted = False
+        self._indexes = None  # re-indexed in the new order
+
+    def _sort(self):
+        """Orders self._all and the heads according to the orderkey.
+
+        Ordering is done lazily: changes to the :class:Layer only mark it as
+        unsorted, and the actual sorting is done once, when the ordered Nodes
+        are requested. Because most changes only append Nodes to already
+        ordered lists, the sort itself is usually linear.
+
+        Subclasses which access self._all directly and rely on its order
+        should call this method first.
+
+        """
+        if not self._sorted:
+            self._all.sort(key=self._orderkey)
+            self._sorted = True
+            self._ordered_heads = None
+        if self._ordered_heads is None:
+            self._ordered_heads = tuple(sorted(self._heads.values(),
+                                               key=self._orderkey))
+
+    def nodes_by_tag(self, tag):
+        """Returns a list of the Nodes in the Layer with the given tag.
+
+        The Nodes are in the Layer order (like :attr:all). The first query
+        after the Layer has changed indexes it in one pass (see the class
+        documentation), later ones take time proportional to the result.
+
+        """
+        return list(self._tag_indexes()[0].get(tag, ()))
+
+    def edges_by_tag(self, tag):
+        """Returns a list of the Edges from Nodes in the Layer with the tag.
+
+        The Edges are ordered by the Layer order of their parents, and then
+        by the order of the parent's Edges (like iterating over the Edges of
+        each Node in :attr:all). Like :meth:nodes_by_tag, only the first
+        query after the Layer has changed takes time proportional to it.
+
+        """
+        return list(self._tag_indexes()[1].get(tag, ()))
+
+    def tag_codes(self):
+        """Returns the tag codes of the Nodes, in the Layer order.
+
+        The codes (see :func:tag_code) are returned as a read-only
+        memoryview of 32-bit ints, so they can be used as an array without
+        copying, e.g. with numpy.frombuffer(codes, dtype=numpy.int32).
+        While the Passage is frozen, the array is computed once.
+
+        """
+        return self._frozen_value('tag_codes', lambda: memoryview(array.array(
+            'i', [tag_code(node._tag) for node in self.all])).toreadonly())
+
+    def edge_tag_codes(self):
+        """Returns the tag codes of the Edges from Nodes in the Layer.
+
+        The Edges are ordered like iterating over the Edges of each Node in
+        :attr:all, and the codes are returned like in :meth:tag_codes.
+
+        """
+        return self._frozen_value('edge_tag_codes', lambda: memoryview(
+            array.array('i', [tag_code(edge._tag) for node in self.all
+                              for edge in node._outgoing])).toreadonly())
+
+    @property
+    def remote_edges(self):
+        return list(self._tag_indexes()[2])
+
+    @property
+    def implicit_nodes(self):
+        return list(self._tag_indexes()[3])
+
+    def _tag_indexes(self):
+        """Returns the indexes of the Layer, building them if needed.
+
+        Returns:
+            (Nodes by tag, Edges from them by tag, remote Edges, implicit
+            Nodes), where the Nodes are in the Layer order and the Edges are
+            ordered like iterating over the Edges of each Node in :attr:all
+
+        """
+        # In bulk mode the Layer isn't updated on changes, so the indexes
+        # are built for each query and aren't kept
+        bulk = self._root._bulk
+        if self._indexes is not None and not bulk:
+            return self._indexes
+        node_tags, edge_tags, remotes, implicits = {}, {}, [], []
+        for node in self.all:
+            node_tags.setdefault(node._tag, []).append(node)
+            if node._attrib._flags & IMPLICIT_FLAG:
+                implicits.append(node)
+            for edge in node._outgoing:
+                edge_tags.setdefault(edge._tag, []).append(edge)
+                if edge._attrib._flags & REMOTE_FLAG:
+                    remotes.append(edge)
+        indexes = (node_tags, edge_tags, remotes, implicits)
+        if not bulk:
+            self._indexes = indexes
+        return indexes
+
+    def is_head(self, node):
+        """Returns whether the :class:Node is one of the heads of the Layer.
+
+        Unlike searching self.heads, this doesn't require ordering the heads
+        and takes constant time.
+
+        """
+        return id(node) in self._heads
+
+    @property
+    def fingerprint(self):
+        version = self._root._version
+        if self._fingerprint is None or self._fingerprint[0] != version:
+            self._fingerprint = (version, _digest(
+                self._attrib._canonical(),
+                sorted(node.fingerprint for node in self.heads)))
+        return self._fingerprint[1]
 
     def equals(self, other, *, ordered=False):
         """Returns whether two Layer objects are equal.
@@ -665,51 +1300,57 @@ class Layer:
             return False
         if len(self.heads) != len(other.heads):
             return False  # can be removed, here for performance gain
+        if type(self) is type(other) and self.fingerprint != other.fingerprint:
+            return False  # equal Layers must have the same fingerprint
         if ordered:
             return all(x1.equals(x2, ordered=True)
                        for x1, x2 in zip(self.heads, other.heads))
         # I can just find the first equal head in unordered search, as
         # Node-equality is an equivalence class (see their for details).
-        heads = list(other.heads)
-        try:
-            for h1 in self.heads:
-                heads.remove([h2 for h2 in heads if h1.equals(h2)][0])
-        except IndexError:
-            return False
-        return True
+        return _match_unordered(self.heads, other.heads,
+                                operator.attrgetter('fingerprint'),
+                                lambda h1, h2: h1.equals(h2))
 
     def _add_edge(self, edge):
         """Alters self.heads if an :class:Edge has been added to the subgraph.
 
-        Should be called when both :class:Node objects of the edge are part
-        of this Layer (and hence part of the subgraph of it).
+        Should be called when the parent :class:Node of the edge is part
+        of this Layer. Edges whose child is in another Layer don't affect
+        the heads.
 
         Args:
             edge: the Edge added to the Layer subgraph
 
         """
-        if edge.child in self._heads:
-            self._heads.remove(edge.child)
+        self._indexes = None
+        child = id(edge.child)
+        if child in self._indegree:
+            self._indegree[child] += 1
+            if self._heads.pop(child, None) is not None:
+                self._ordered_heads = None
         # Order may depend on edges, so re-order
-        self._all.sort(key=self._orderkey)
-        self._heads.sort(key=self._orderkey)
+        self._sorted = False
 
     def _remove_edge(self, edge):
         """Alters self.heads if an :class:Edge has been removed.
 
-        Should be called when both :class:Node objects of the edge are part
-        of this Layer (and hence part of the subgraph of it).
+        Should be called when the parent :class:Node of the edge is part
+        of this Layer. Edges whose child is in another Layer don't affect
+        the heads.
 
         Args:
             edge: the Edge removed from the Layer subgraph
 
         """
-        if all(p.layer != edge.child.layer for p in edge.child.parents):
-            self._heads.append(edge.child)
-            self._heads.sort(key=self._orderkey)
+        self._indexes = None
+        child = id(edge.child)
+        if child in self._indegree:
+            self._indegree[child] -= 1
+            if not self._indegree[child]:
+                self._heads[child] = edge.child
+                self._ordered_heads = None
         # Order may depend on edges, so re-order
-        self._all.sort(key=self._orderkey)
-        self._heads.sort(key=self._orderkey)
+        self._sorted = False
 
     def _add_node(self, node):
         """Adds a :class:node to the :class:Layer.
@@ -718,9 +1359,11 @@ class Layer:
 
         """
         self._all.append(node)
-        self._all.sort(key=self._orderkey)
-        self._heads.append(node)
-        self._heads.sort(key=self._orderkey)
+        self._indegree[id(node)] = 0
+        self._heads[id(node)] = node
+        self._indexes = None
+        self._ordered_heads = None
+        self._sorted = False
 
     def _remove_node(self, node):
         """Removes a :class:node from the :class:Layer.
@@ -729,7 +1372,73 @@ class Layer:
 
         """
         self._all.remove(node)
-        self._heads.remove(node)
+        del self._indegree[id(node)]
+        self._indexes = None
+        if self._heads.pop(id(node), None) is not None:
+            self._ordered_heads = None
+
+    def _frozen_value(self, name, compute):
+        """Returns compute(), memoized under name while the Passage is frozen.
+
+        Values derived from a frozen Passage can't change, so Layers and
+        their Nodes compute them once. Values of a Node should be named
+        with the id() of the Node, e.g. ('depth', id(node)).
+
+        Args:
+            name: the name of the value in the Layer
+            compute: function with no arguments which computes the value
+
+        """
+        values = self._frozen_values
+        if values is None:
+            return compute()
+        if name not in values:
+            values[name] = compute()
+        return values[name]
+
+    def _refresh(self):
+        """Recomputes the heads and order of the :class:Layer from scratch.
+
+        Called when a bulk modification of the :class:Passage ends, after
+        all changes to the Layer were done without updating its heads.
+        Subclasses which maintain more state should override this method
+        (calling it from the overriding one), and recompute their state in
+        one pass over the Layer.
+
+        """
+        indegree = dict.fromkeys((id(node) for node in self._all), 0)
+        for node in self._all:
+            for edge in node._outgoing:
+                child = id(edge.child)
+                if child in indegree:
+                    indegree[child] += 1
+        self._indegree = indegree
+        self._heads = {id(node): node for node in self._all
+                       if not indegree[id(node)]}
+        self._ordered_heads = None
+        self._sorted = False
+        self._indexes = None
+
+    def __getstate__(self):
+        # The id() of each Node changes when unpickled, so keep the Nodes
+        state = self.__dict__.copy()
+        state['_indegree'] = [self._indegree[id(node)] for node in self._all]
+        state['_heads'] = list(self._heads.values())
+        state['_indexes'] = None
+        if state['_frozen_values'] is not None:  # may be keyed by id()
+            state['_frozen_values'] = {}
+        return state
+
+    def __setstate__(self, state):
+        if '_indegree' not in state:  # pickled before these were kept
+            # recomputed when the Passage is unpickled (see _refresh)
+            state = dict(state, _indegree=(), _ordered_heads=None,
+                         _sorted=False, _indexes=None, _fingerprint=None,
+                         _frozen_values=None)
+        self.__dict__.update(state)
+        self._indegree = {id(node): degree for node, degree
+                          in zip(self._all, self._indegree)}
+        self._heads = {id(node): node for node in self._heads}
 
     def _change_edge_tag(self, edge, old_tag):
         """Updates the :class:Layer objects with the change.
@@ -739,7 +1448,7 @@ class Layer:
             old_tag: the Edge's tag before the change
 
         """
-        pass  # meant to be overriden by subclasses
+        self._indexes = None
 
     def _change_node_tag(self, node, old_tag):
         """Updates the :class:Layer objects with the change.
@@ -749,7 +1458,19 @@ class Layer:
             old_tag: the Node's tag before the change
 
         """
-        pass  # meant to be overriden by subclasses
+        self._indexes = None
+
+    def _change_attribute(self, element, key):
+        """Updates the :class:Layer objects with the change.
+
+        Args:
+            element: the :class:Node in the Layer or the :class:Edge from a
+                Node in the Layer whose attributes were changed
+            key: the key of the changed attribute
+
+        """
+        if key in ('remote', 'implicit'):
+            self._indexes = None
 
 
 class Passage:
@@ -767,6 +1488,15 @@ class Passage:
         layers: all Layers of the Passage, no order guaranteed
         nodes: dictionary of ID-node pairs for all the nodes in the Passage
         frozen: indicates whether the Passage can be modified or not, boolean.
+        in_bulk: whether the Passage is being modified in bulk (see bulk()).
+        fingerprint: a digest of the attributes and the fingerprints of the
+            Layers (with their IDs), equal for equivalent Passages. Can be
+            used to find duplicate annotations, regardless of the Passage ID.
+
+    Changes to the Passage can be observed using :meth:subscribe, e.g. for
+    maintaining indexes incrementally, and can be undone using
+    :meth:checkpoint and :meth:rollback. Subscribers and checkpoints aren't
+    pickled.
 
     """
 
@@ -778,11 +1508,25 @@ class Passage:
 
         """
         self._ID = ID
-        self._attrib = _AttributeDict(self, attrib)
+        self._root = self  # for ModifyPassage, like the Passage's elements
+        self._attrib = _AttributeDict(self, attrib, self)
         self.extra = {}
         self._layers = {}
         self._nodes = {}
-        self.frozen = False
+        self._bulk = 0
+        # Incremented on every change, so cached fingerprints can be
+        # identified as outdated
+        self._version = 0
+        self._fingerprint = None  # (version, digest) when computed
+        self._compiled = None  # (version, CompiledPassage) when compiled
+        # (callback, event types or None) pairs; never changed in place, so
+        # callbacks can (un)subscribe while events are delivered
+        self._observers = []
+        self._undo_log = None  # list of events since the first checkpoint
+        # id() of each logged EdgeRemoved: the positions the Edge had (see
+        # Node._link), so rolling back keeps the order of parallel Edges
+        self._unlinked_at = {}
+        self._frozen = False
 
     @property
     def ID(self):
@@ -792,6 +1536,23 @@ class Passage:
     def root(self):
         return self
 
+    @property
+    def frozen(self):
+        return self._frozen
+
+    @frozen.setter
+    def frozen(self, value):
+        """Sets whether the Passage is frozen.
+
+        While frozen, nothing in the Passage can change, so the Layers
+        memoize values derived from it (see :meth:Layer._frozen_value).
+        These are dropped when the Passage is unfrozen.
+
+        """
+        self._frozen = value
+        for layer in self._layers.values():
+            layer._frozen_values = {} if value else None
+
     @property
     def attrib(self):
         return self._attrib
@@ -804,6 +1565,20 @@ class Passage:
     def nodes(self):
         return self._nodes.copy()
 
+    @property
+    def in_bulk(self):
+        return self._bulk > 0
+
+    @property
+    def fingerprint(self):
+        version = self._version
+        if self._fingerprint is None or self._fingerprint[0] != version:
+            self._fingerprint = (version, _digest(
+                self._attrib._canonical(),
+                sorted(_canonical(ID) + '=' + layer.fingerprint
+                       for ID, layer in self._layers.items())))
+        return self._fingerprint[1]
+
     def layer(self, ID):
         """Returns the :class:Layer object whose ID is given.
 
@@ -834,6 +1609,8 @@ class Passage:
             return False
         if len(self.layers) != len(other.layers):
             return False  # can be removed, here for performance gain
+        if type(self) is type(other) and self.fingerprint != other.fingerprint:
+            return False  # equivalent Passages have the same fingerprint
         try:
             for lid, l1 in self._layers.items():
                 l2 = other.layer(lid)
@@ -850,6 +1627,12 @@ class Passage:
         truly copying the Passage attributes (attrib, extra, ID, frozen)
         and creating the equivalent layers (each layer for itself).
 
+        The layers are copied in bulk mode (see :meth:bulk), in the order
+        they were added to self (regardless of the order of the IDs given),
+        so a Layer may copy Edges to Nodes of Layers added before it (e.g.
+        from the foundational layer to Terminals). Edges to Nodes of layers
+        which are not copied are omitted.
+
         Args:
             layers: sequence of layer IDs to copy to the new object.
 
@@ -861,16 +1644,224 @@ class Passage:
             UnimplementedMethodError if copying for a layer is unimplemented.
 
         """
+        for lid in layers:
+            self.layer(lid)  # raises KeyError for a missing ID
         other = Passage(ID=self.ID, attrib=self.attrib.copy())
         other.extra = self.extra.copy()
-        for lid in layers:
-            try:
-                self.layer(lid).copy(other)
-            except AttributeError:
-                raise UnimplementedMethodError()
+        with other.bulk():
+            for lid, layer in self._layers.items():
+                if lid not in layers:
+                    continue
+                try:
+                    copy = layer.copy
+                except AttributeError:
+                    raise UnimplementedMethodError()
+                copy(other)
         other.frozen = self.frozen
         return other
 
+    def compile(self):
+        """Returns a compiled, read-only view of the Passage.
+
+        The view (see :class:compiled.CompiledPassage) answers structural
+        queries with flat arrays, and is meant for frozen Passages. It is
+        cached until the Passage is changed, so compiling a frozen Passage
+        again is free.
+
+        Returns:
+            a :class:compiled.CompiledPassage of the current Passage
+
+        """
+        from ucca import compiled  # compiled imports the layers modules
+        if self._compiled is None or self._compiled[0] != self._version:
+            self._compiled = (self._version, compiled.CompiledPassage(self))
+        return self._compiled[1]
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """Context manager for building or changing the Passage in bulk.
+
+        Inside the context, adding and removing :class:Node and :class:Edge
+        objects only links them, without maintaining any state derived from
+        them: the order of Edges in each Node, the heads and order of the
+        :class:Layer objects, and any layer-specific state (such as top
+        scenes in the foundational layer). When the (outermost) context
+        exits, this state is recomputed once for the whole Passage.
+
+        Hence, in the context such derived state should not be relied upon,
+        but changing the Passage is linear in the number of changes.
+        Contexts may be nested.
+
+        Yields:
+            the Passage itself
+
+        """
+        self._bulk += 1
+        try:
+            yield self
+        finally:
+            self._bulk -= 1
+            if not self._bulk:
+                self._refresh()
+
+    def subscribe(self, callback, *event_types):
+        """Calls callback after each change of the :class:Passage.
+
+        Changes are reported as events, which are the named tuples in this
+        module (NodeAdded, NodeRemoved, EdgeAdded, EdgeRemoved, NodeTagChanged,
+        EdgeTagChanged and AttributeChanged). An event is created only when
+        there are subscribers, so changes are not slower without them.
+
+        Events are delivered in bulk mode too (see :meth:bulk), but then the
+        order of Nodes and Edges and the Layers state may be outdated.
+
+        Args:
+            callback: function which takes an event as the only argument
+            event_types: if given, only events of these types are delivered
+
+        """
+        self._observers = self._observers + [(callback,
+                                              frozenset(event_types) or None)]
+
+    def unsubscribe(self, callback):
+        """Stops calling callback on changes (see :meth:subscribe).
+
+        Raises:
+            ValueError: if callback isn't subscribed
+
+        """
+        for i, (subscribed, _) in enumerate(self._observers):
+            if subscribed == callback:
+                self._observers = self._observers[:i] + self._observers[i + 1:]
+                return
+        raise ValueError("callback is not subscribed")
+
+    def _notify(self, event):
+        """Delivers the event to all subscribers which requested its type."""
+        for callback, event_types in self._observers:
+            if event_types is None or type(event) in event_types:
+                callback(event)
+
+    def checkpoint(self):
+        """Starts recording changes, so they can be undone by :meth:rollback.
+
+        Changes are recorded (as the events delivered to subscribers, see
+        :meth:subscribe) from the first checkpoint until :meth:commit is
+        called, so checkpoints are cheap and can be nested.
+
+        Returns:
+            a token to pass to rollback, for returning to the current state.
+            Tokens taken after the checkpoint rolled back to are invalidated.
+
+        """
+        if self._undo_log is None:
+            self._undo_log = []
+            self.subscribe(self._undo_log.append)
+        return self._undo_log, len(self._undo_log)
+
+    def rollback(self, token):
+        """Undoes all changes done since the checkpoint of the token.
+
+        Nodes and Edges which were removed are linked back (the same
+        objects, and in the same places), and new ones are removed. The
+        changes are undone one by one, like any change, so the state derived
+        from them (such as the heads and the top scenes of the Layers) is
+        updated only where they were, and subscribers are notified of them.
+        Layers added after the checkpoint are kept (without Nodes).
+
+        Args:
+            token: the token returned by :meth:checkpoint
+
+        Raises:
+            ValueError: if the token is not of a current checkpoint.
+            FrozenPassageError: if the Passage is frozen
+
+        """
+        if self._frozen:
+            raise FrozenPassageError()
+        log, position = token
+        if log is not self._undo_log or position > len(log):
+            raise ValueError("the checkpoint is no longer valid")
+        for event in reversed(log[position:]):
+            self._undo(event)
+        for event in log[position:]:  # including the events of the undoing
+            self._unlinked_at.pop(id(event), None)
+        del log[position:]
+
+    def commit(self):
+        """Stops recording changes, invalidating all checkpoints."""
+        if self._undo_log is not None:
+            self.unsubscribe(self._undo_log.append)
+            self._undo_log = None
+            self._unlinked_at = {}
+
+    def _undo(self, event):
+        """Reverts the change reported by the event."""
+        kind = type(event)
+        if kind is NodeAdded:  # all its Edges were already undone
+            self._remove_node(event.node)
+        elif kind is NodeRemoved:
+            self._add_node(event.node)
+        elif kind is EdgeAdded:
+            event.edge.parent._unlink(event.edge)
+        elif kind is EdgeRemoved:
+            event.edge.parent._link(event.edge,
+                                    self._unlinked_at.pop(id(event), None))
+        elif kind is NodeTagChanged:
+            event.node.tag = event.old_tag
+        elif kind is EdgeTagChanged:
+            event.edge.tag = event.old_tag
+        elif event.old_value is NO_VALUE:  # AttributeChanged
+            del event.element._attrib[event.key]
+        else:
+            event.element._attrib[event.key] = event.old_value
+
+    def __getstate__(self):
+        # Subscribers are usually bound methods of other objects, or
+        # functions which can't be pickled at all
+        state = self.__dict__.copy()
+        state['_observers'] = []
+        state['_undo_log'] = None
+        state['_unlinked_at'] = {}
+        state['_compiled'] = None
+        return state
+
+    def __setstate__(self, state):
+        if 'frozen' not in state:
+            self.__dict__.update(state)
+            return
+        # Pickled before the derived state was kept (and the elements had
+        # __slots__), so it's recomputed once all the elements are unpickled
+        state = dict(state)
+        frozen = state.pop('frozen')
+        self.__dict__.update(state)
+        self._root = self
+        self._bulk = 0
+        self._version = 0
+        self._fingerprint = None
+        self._compiled = None
+        self._observers = []
+        self._undo_log = None
+        self._unlinked_at = {}
+        self._frozen = False
+        self._attrib._owner = self
+        for layer in self._layers.values():
+            layer._attrib._owner = layer
+        for node in self._nodes.values():
+            node._attrib._owner = node
+            for edge in node._outgoing:
+                edge._idkey = (node._idkey, edge._child._idkey)
+                edge._attrib._owner = edge
+        self._refresh()
+        self.frozen = frozen
+
+    def _refresh(self):
+        """Recomputes all derived state of the Passage after bulk changes."""
+        for node in self._nodes.values():
+            node._sort_edges()
+        for layer in self._layers.values():
+            layer._refresh()
+
     def by_id(self, ID):
         """Returns a Node whose ID is given.
 
@@ -903,10 +1894,11 @@ class Passage:
         if layer.ID in self._layers:
             raise DuplicateIdError()
         self._layers[layer.ID] = layer
+        self._version += 1
 
     @ModifyPassage
     def _add_node(self, node):
-        """Adds a :class:Node object to the :class:Passage.
+        """Adds a :class:Node object to the :class:Passage and its Layer.
 
         Args:
             node: the Node object to add
@@ -921,19 +1913,27 @@ class Passage:
         if node.ID in self._nodes:
             raise DuplicateIdError()
         self._nodes[node.ID] = node
+        node.layer._add_node(node)
+        self._version += 1
+        if self._observers:
+            self._notify(NodeAdded(node))
 
     def _remove_node(self, node):
-        """Removes a :class:Node object from the :class:Passage.
+        """Removes a :class:Node object from the :class:Passage and its Layer.
 
         Args:
             node: the Node object to remove, must be unlinked with any other
-                Node objects and removed from its :class:Layer.
+                Node objects.
 
         Raises:
             KeyError: if no Node with this ID is present
 
         """
+        node.layer._remove_node(node)
         del self._nodes[node.ID]
+        self._version += 1
+        if self._observers:
+            self._notify(NodeRemoved(node))
 
     @ModifyPassage
     def _add_edge(self, edge):
@@ -945,20 +1945,35 @@ class Passage:
             edge: the Edge object to add
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._add_edge(edge)
-
-    def _remove_edge(self, edge):
+        # The Passage only records that it was changed, and Layers are
+        # updated only when not in bulk mode
+        self._version += 1
+        if not self._bulk:
+            edge.parent.layer._add_edge(edge)
+        if self._observers:
+            self._notify(EdgeAdded(edge))
+
+    def _remove_edge(self, edge, positions=None):
         """Removes a :class:Edge object from :class:Passage.
 
         Handles altering the Passage and :class:Layer objects accordingly.
 
         Args:
             edge: the Edge object to remove
+            positions: the positions the Edge had in its parent and child
+                (see :meth:Node._link), recorded for :meth:rollback
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._remove_edge(edge)
+        # The Passage only records that it was changed, and Layers are
+        # updated only when not in bulk mode
+        self._version += 1
+        if not self._bulk:
+            edge.parent.layer._remove_edge(edge)
+        if self._observers:
+            event = EdgeRemoved(edge)
+            if self._undo_log is not None:
+                self._unlinked_at[id(event)] = positions
+            self._notify(event)
 
     def _change_edge_tag(self, edge, old_tag):
         """Updates the :class:Passage and :class:Layer objects with the change.
@@ -968,8 +1983,13 @@ class Passage:
             old_tag: the Edge's tag before the change
 
         """
-        # Currently no work is done in the Passage level
-        edge.parent.layer._change_edge_tag(edge, old_tag)
+        # The Passage only records that it was changed, and Layers are
+        # updated only when not in bulk mode
+        self._version += 1
+        if not self._bulk:
+            edge.parent.layer._change_edge_tag(edge, old_tag)
+        if self._observers:
+            self._notify(EdgeTagChanged(edge, old_tag))
 
     def _change_node_tag(self, node, old_tag):
         """Updates the :class:Passage and :class:Layer objects with the change.
@@ -979,5 +1999,32 @@ class Passage:
             old_tag: the Node's tag before the change
 
         """
-        # Currently no work is done in the Passage level
-        node.layer._change_node_tag(node, old_tag)
+        # The Passage only records that it was changed, and Layers are
+        # updated only when not in bulk mode
+        self._version += 1
+        if not self._bulk:
+            node.layer._change_node_tag(node, old_tag)
+        if self._observers:
+            self._notify(NodeTagChanged(node, old_tag))
+
+    def _change_attribute(self, element, key, old_value, new_value):
+        """Updates the :class:Passage and :class:Layer objects with the change.
+
+        Args:
+            element: the element whose attributes were changed (the
+                Passage, a :class:Layer, a :class:Node or an :class:Edge)
+            key: the key of the changed attribute
+            old_value: the previous value, or NO_VALUE if it was just set
+            new_value: the current value, or NO_VALUE if it was deleted
+
+        """
+        # The Passage only records that it was changed, and Layers are
+        # updated only when not in bulk mode
+        self._version += 1
+        if not self._bulk:
+            if isinstance(element, Edge):
+                element.parent.layer._change_attribute(element, key)
+            elif isinstance(element, Node):
+                element.layer._change_attribute(element, key)
+        if self._observers:
+            self._notify(AttributeChanged(element, key, old_value, new_value))
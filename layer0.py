@@ -20,6 +20,9 @@ class NodeTags:
     __init__ = None
 
 
+core.intern_tags(NodeTags)
+
+
 ATTRIB_KEYS = ('text', 'paragraph', 'paragraph_position')
 
 
@@ -45,24 +48,43 @@ class Terminal(core.Node):
             starting at 1 (per paragraph).
         punct: whether the Terminal is a punctuation mark (boolean)
 
+    The text, paragraph, paragraph position and punctuation flag are read
+    from the columns of the :class:Layer0 (indexed by position), so reading
+    them doesn't copy the attributes. Once the Terminal is removed from the
+    Layer0, they are read from its own attributes and tag.
+
     """
 
+    # The Layer0 and the position, set when the Terminal is added to it
+    __slots__ = ('_layer0', '_position')
+
+    def _in_columns(self):
+        """Returns whether the Layer0 columns hold self (i.e. not removed)."""
+        terminals = self._layer0._terminals
+        return (self._position < len(terminals) and
+                terminals[self._position] is self)
+
     @property
     def text(self):
-        return self.attrib['text']
+        if self._in_columns():
+            return self._layer0._texts[self._position]
+        return self._attrib.get('text')
 
     @property
     def position(self):
-        # the format of ID is LAYER_ID + ID separator + position
-        return int(self.ID[len(LAYER_ID) + len(core.Node.ID_SEPARATOR):])
+        return self._position
 
     @property
     def para_pos(self):
-        return self.attrib['paragraph_position']
+        if self._in_columns():
+            return self._layer0._para_pos[self._position]
+        return self._attrib.get('paragraph_position')
 
     @property
     def paragraph(self):
-        return self.attrib['paragraph']
+        if self._in_columns():
+            return self._layer0._paragraphs[self._position]
+        return self._attrib.get('paragraph')
 
     @property
     def attrib(self):
@@ -70,7 +92,9 @@ class Terminal(core.Node):
 
     @property
     def punct(self):
-        return self.tag == NodeTags.Punct
+        if self._in_columns():
+            return self._layer0._puncts[self._position]
+        return self._tag == NodeTags.Punct
 
     def equals(self, other, *, ordered=False):
         """Equals if the Terminals are of the same Layer, tag, position & text.
@@ -88,6 +112,12 @@ class Terminal(core.Node):
                 and self.paragraph == other.paragraph
                 and self.para_pos == other.para_pos)
 
+    def _digest(self):
+        """Returns the digest of the fields compared by :meth:equals."""
+        return core._digest(*(core._canonical(x) for x in (
+            self.layer.ID, self.text, self.position, self.tag,
+            self.paragraph, self.para_pos)))
+
     def __eq__(self, other):
         """Equals if both of the same Passage, Layer, position, tag & text."""
         if other.layer.ID != LAYER_ID:
@@ -118,18 +148,124 @@ class Layer0(core.Layer):
         words: a tuple of only the words (not punctuation) Terminals, ordered
         pairs: a tuple of (position, terminal) tuples of all Terminals, ordered
 
+    The Terminals and their text, paragraph, paragraph position and whether
+    they are punctuation are kept in columns, lists indexed by position
+    (index 0 is unused, as positions start at 1). The columns are updated
+    when Terminals are added or removed and when their attributes or tags
+    change, or recomputed after a bulk modification of the Passage.
+
     """
 
     def __init__(self, root, attrib=None):
+        self._init_columns()
         return super().__init__(ID=LAYER_ID, root=root, attrib=attrib)
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if '_terminals' not in state:  # pickled before the columns were kept
+            self._init_columns()  # filled when the Passage is unpickled
+
+    def _init_columns(self):
+        """Creates the columns, without any Terminals."""
+        self._terminals = [None]
+        self._texts = [None]
+        self._paragraphs = [None]
+        self._para_pos = [None]
+        self._puncts = [False]
+        self._para_starts = None  # computed by _paragraph_starts
+
+    def _columns(self):
+        return (self._terminals, self._texts, self._paragraphs,
+                self._para_pos, self._puncts)
+
+    def _set_columns(self, terminal):
+        """Writes the values of the Terminal to the columns."""
+        position = terminal._position
+        missing = position + 1 - len(self._terminals)
+        if missing > 0:  # Terminals may be added out of order
+            for column in self._columns():
+                column.extend([column[0]] * missing)
+        attrib = terminal._attrib
+        self._terminals[position] = terminal
+        self._texts[position] = attrib.get('text')
+        self._paragraphs[position] = attrib.get('paragraph')
+        self._para_pos[position] = attrib.get('paragraph_position')
+        self._puncts[position] = terminal._tag == NodeTags.Punct
+        self._para_starts = None
+
+    def _clear_columns(self, terminal):
+        """Removes the values of the Terminal from the columns."""
+        position = terminal._position
+        for column in self._columns():
+            column[position] = column[0]
+        while len(self._terminals) > 1 and self._terminals[-1] is None:
+            for column in self._columns():
+                column.pop()
+        self._para_starts = None
+
+    def _paragraph_starts(self):
+        """Returns the position of the first Terminal of each paragraph.
+
+        The list is indexed by paragraph (index 0 is unused), and ends with
+        the position after the last Terminal. Paragraphs are assumed to be
+        contiguous and numbered from 1, as add_terminal creates them.
+
+        """
+        if self._para_starts is None:
+            starts = [1]
+            paragraphs = self._paragraphs
+            for position in range(1, len(paragraphs)):
+                while len(starts) <= (paragraphs[position] or 0):
+                    starts.append(position)
+            starts.append(len(paragraphs))
+            self._para_starts = starts
+        return self._para_starts
+
+    def _set_position(self, terminal):
+        """Links the Terminal with self, and sets its position from its ID."""
+        terminal._layer0 = self
+        # the format of ID is LAYER_ID + ID separator + position
+        terminal._position = int(terminal.ID[len(LAYER_ID) +
+                                             len(core.Node.ID_SEPARATOR):])
+
+    def _add_node(self, node):
+        super()._add_node(node)
+        self._set_position(node)
+        self._set_columns(node)
+
+    def _remove_node(self, node):
+        super()._remove_node(node)
+        self._clear_columns(node)
+
+    def _change_node_tag(self, node, old_tag):
+        super()._change_node_tag(node, old_tag)
+        self._set_columns(node)
+
+    def _change_attribute(self, element, key):
+        super()._change_attribute(element, key)
+        if isinstance(element, Terminal):
+            self._set_columns(element)
+
+    def _refresh(self):
+        """Recomputes heads, order and the columns in one pass."""
+        super()._refresh()
+        for terminal in self._all:
+            self._set_position(terminal)
+            self._set_columns(terminal)
+
     @property
     def words(self):
-        return tuple(x for x in self.all if not x.punct)
+        return self._frozen_value('words', lambda: tuple(
+            x for x, punct in zip(self._terminals, self._puncts)
+            if x is not None and not punct))
 
     @property
     def pairs(self):
-        return tuple(zip(range(1, len(self.all) + 1), self._all))
+        def _pairs():
+            self._sort()
+            return tuple(zip(range(1, len(self._all) + 1), self._all))
+
+        return self._frozen_value('pairs', _pairs)
 
     def by_position(self, pos):
         """Returns the Terminals at the position given.
@@ -144,7 +280,30 @@ class Layer0(core.Layer):
             IndexError if the position is out of bounds
 
         """
-        return self._all[pos - 1]  # positions start at 1, not 0
+        if pos < 1:  # as negative indices would be valid in the columns
+            raise IndexError(pos)
+        terminal = self._terminals[pos]
+        if terminal is None:
+            raise IndexError(pos)
+        return terminal
+
+    def by_paragraph(self, paragraph):
+        """Returns the Terminals of the paragraph given, ordered.
+
+        Args:
+            paragraph: the paragraph number, starting at 1
+
+        Returns:
+            a list of the Terminals in the paragraph
+
+        Raises:
+            IndexError if there is no such paragraph
+
+        """
+        starts = self._paragraph_starts()
+        if not 1 <= paragraph < len(starts) - 1:
+            raise IndexError(paragraph)
+        return self._terminals[starts[paragraph]:starts[paragraph + 1]]
 
     def add_terminal(self, text, punct, paragraph=1):
         """Adds the next Terminal at the next available position.
@@ -165,19 +324,52 @@ class Layer0(core.Layer):
                 caused by un-ordered Terminal positions in the layer
 
         """
-        position = len(self.all) + 1  # we want positions to start with 1
-        if position > 1 and paragraph == self.all[-1].paragraph:
-            para_pos = self.all[-1].para_pos + 1
-        else:
-            para_pos = 1
-
-        tag = NodeTags.Punct if punct else NodeTags.Word
-        return Terminal(ID="{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR,
-                                           position),
-                        root=self.root, tag=tag,
-                        attrib={'text': text,
-                                'paragraph': paragraph,
-                                'paragraph_position': para_pos})
+        return self.add_terminals([text], [punct], [paragraph])[0]
+
+    def add_terminals(self, tokens, punct_flags, paragraphs=None):
+        """Adds Terminals at the next available positions, in one pass.
+
+        Like calling :meth:add_terminal for each token, but the position and
+        paragraph position of each Terminal are computed from the previous
+        one, so adding n Terminals takes O(n) time.
+
+        Args:
+            tokens: the texts of the Terminals
+            punct_flags: for each token, whether it's a punctuation mark
+            paragraphs: for each token, its paragraph number, defaults to 1
+                for all tokens
+
+        Returns:
+            a list of the created Terminals
+
+        Raises:
+            DuplicateIdError: if trying to add an already existing Terminal,
+                caused by un-ordered Terminal positions in the layer
+            ValueError: if punct_flags or paragraphs aren't of the same
+                length as tokens
+
+        """
+        if paragraphs is None:
+            paragraphs = [1] * len(tokens)
+        if not len(tokens) == len(punct_flags) == len(paragraphs):
+            raise ValueError("tokens, punct_flags and paragraphs must be of "
+                             "the same length")
+        position = len(self._terminals)  # the last position + 1
+        last_paragraph = self._paragraphs[-1]
+        para_pos = self._para_pos[-1] or 0
+        root = self._root
+        terminals = []
+        for text, punct, paragraph in zip(tokens, punct_flags, paragraphs):
+            para_pos = para_pos + 1 if paragraph == last_paragraph else 1
+            last_paragraph = paragraph
+            terminals.append(Terminal(
+                ID="{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR,
+                                   position),
+                root=root, tag=NodeTags.Punct if punct else NodeTags.Word,
+                attrib={'text': text, 'paragraph': paragraph,
+                        'paragraph_position': para_pos}))
+            position += 1
+        return terminals
 
     def copy(self, other_passage):
         """Creates a copied Layer0 object and Terminals in other_passage.
@@ -185,12 +377,19 @@ class Layer0(core.Layer):
         Args:
             other_passage: the Passage to copy self to
 
+        Returns:
+            the new Layer0 object
+
         """
         other = Layer0(root=other_passage, attrib=self.attrib.copy())
         other.extra = self.extra.copy()
-        for t in self._all:
-            copied = other.add_terminal(t.text, t.punct, t.paragraph)
-            copied.extra = t.extra.copy()
+        with other_passage.bulk():
+            for t in self.all:
+                copied = Terminal(ID=t.ID, root=other_passage, tag=t.tag,
+                                  attrib=t._attrib)
+                if t._extra:
+                    copied.extra = t._extra.copy()
+        return other
 
 
 def is_punct(node):
@@ -8,6 +8,7 @@ the type of relation between the Nodes.
 
 """
 
+import bisect
 import operator
 
 from ucca import core, layer0
@@ -46,6 +47,10 @@ class EdgeTags:
     __init__ = None
 
 
+core.intern_tags(NodeTags)
+core.intern_tags(EdgeTags)
+
+
 # Attribute entries
 ATTRIB_KEYS = ('remote', 'implicit', 'uncertain', 'suggest')
 
@@ -73,9 +78,9 @@ def _single_child_by_tag(node, tag, must=True):
         MissingRelationError if Node not found and must is set to True
 
     """
-    for edge in list(node):
-        if edge.tag == tag:
-            return edge.child
+    edges = node._edges_by_tag().get(tag)
+    if edges:
+        return edges[0].child
     if must:
         raise MissingRelationError()
     else:
@@ -93,7 +98,7 @@ def _multiple_children_by_tag(node, tag):
         A list of connected Nodes, can be empty
 
     """
-    return [edge.child for edge in list(node) if edge.tag == tag]
+    return [edge.child for edge in node._edges_by_tag().get(tag, ())]
 
 
 class PunctNode(core.Node):
@@ -109,6 +114,8 @@ class PunctNode(core.Node):
 
     """
 
+    __slots__ = ()
+
     @property
     def terminals(self):
         return self.children
@@ -142,6 +149,8 @@ class Linkage(core.Node):
 
     """
 
+    __slots__ = ()
+
     @property
     def relation(self):
         return _single_child_by_tag(self, EdgeTags.LinkRelation)
@@ -204,10 +213,31 @@ class FoundationalNode(core.Node):
             head, which returns None.
         ftag: the tag of the Edge connecting the fparent (as described above)
             with this FNode
+        depth: the number of fparent steps from this FNode to the top of the
+            FNode tree (0 for the Passage head)
         discontiguous: whether this FNode has continuous Terminals or not
 
+    The Terminals in the span of the FNode are computed once and kept until
+    the Edges below it change, so the span properties take constant time
+    after the first computation (except in bulk mode, see
+    :meth:core.Passage.bulk, where nothing is kept).
+
+    The FNode tree (ignoring remote Edges) is indexed by the Layer, so
+    :attr:depth, :meth:is_ancestor, :meth:lca and :meth:ancestors_with_tag
+    take constant time (or time proportional to the result), after the index
+    is built in one pass over the Layer. The index is rebuilt lazily, on the
+    first query after the Layer has changed.
+
     """
 
+    # Terminals in the span (as get_terminals() returns them), None if the
+    # span changed since they were computed
+    __slots__ = ('_terminals',)
+
+    def __init__(self, *args, **kwargs):
+        self._terminals = None
+        super().__init__(*args, **kwargs)
+
     @property
     def participants(self):
         return _multiple_children_by_tag(self, EdgeTags.Participant)
@@ -266,10 +296,16 @@ class FoundationalNode(core.Node):
 
     def _fedge(self):
         """Returns the Edge of the fparent, or None."""
+        layer = self.layer
+        if layer._frozen_values is not None:  # the index can't be outdated
+            return layer._ancestor_index().fedge(self)
+        index = layer._ancestors
+        if index is not None and not self._root._bulk:
+            return index.fedge(self)
         for edge in self.incoming:
             if (edge.parent.layer.ID == LAYER_ID and
                     edge.parent.tag == NodeTags.Foundational and
-                    not edge.attrib.get('remote')):
+                    not edge._attrib._flags & core.REMOTE_FLAG):
                 return edge
         return None
 
@@ -283,6 +319,49 @@ class FoundationalNode(core.Node):
         edge = self._fedge()
         return edge.tag if edge else None
 
+    @property
+    def depth(self):
+        return self.layer._ancestor_index().depth(self)
+
+    def is_ancestor(self, other):
+        """Returns whether self is an FNode ancestor of other.
+
+        Args:
+            other: a Node in this Layer
+
+        Returns:
+            True iff self is other's fparent, or its fparent's, and so on.
+
+        """
+        return self.layer._ancestor_index().is_ancestor(self, other)
+
+    def lca(self, other):
+        """Returns the lowest common FNode ancestor of self and other.
+
+        Args:
+            other: a Node in this Layer
+
+        Returns:
+            the deepest Node which is self or its ancestor, and is other or
+            its ancestor. None if they are in different trees (e.g. when
+            other is a Linkage).
+
+        """
+        return self.layer._ancestor_index().lca(self, other)
+
+    def ancestors_with_tag(self, tag):
+        """Returns the FNode ancestors of self with the given ftag.
+
+        Args:
+            tag: the tag of the Edge from the ancestor to its own fparent
+                (e.g. EdgeTags.ParallelScene to get the enclosing scenes)
+
+        Returns:
+            a list of the ancestors, starting from the closest one
+
+        """
+        return self.layer._ancestor_index().ancestors_with_tag(self, tag)
+
     def get_terminals(self, punct=True, remotes=False):
         """Returns a list of all terminals under the span of this FNode.
 
@@ -295,9 +374,27 @@ class FoundationalNode(core.Node):
             a list of :class:layer0.Terminal objects
 
         """
+        if punct and not remotes:
+            return list(self._span())
+        return self._collect_terminals(punct, remotes)
+
+    def _span(self):
+        """Returns a tuple of the Terminals in the span, computing if needed.
+
+        The Terminals are the ones get_terminals() returns by default.
+
+        """
+        if self._root._bulk:
+            return tuple(self._collect_terminals(True, False))
+        if self._terminals is None:
+            self._terminals = tuple(self._collect_terminals(True, False))
+        return self._terminals
+
+    def _collect_terminals(self, punct, remotes):
+        """Collects the Terminals for get_terminals() from the children."""
         terms = []
         for edge in list(self):
-            if ((edge.attrib.get('remote', False) and not remotes) or
+            if ((edge._attrib._flags & core.REMOTE_FLAG and not remotes) or
                     (edge.tag == EdgeTags.Punctuation and not punct)):
                 continue
             elif edge.tag == EdgeTags.Terminal:
@@ -312,27 +409,31 @@ class FoundationalNode(core.Node):
     @property
     def start_position(self):
         try:
-            return self.get_terminals()[0].position
+            return self._span()[0].position
         except IndexError:  # implicit unit or having no Terminals
             return -1
 
     @property
     def end_position(self):
         try:
-            return self.get_terminals()[-1].position
+            return self._span()[-1].position
         except IndexError:  # implicit unit or having no Terminals
             return -1
 
     @property
     def discontiguous(self):
-        terms = self.get_terminals()
-        return any(terms[i].position + 1 != terms[i + 1].position
-                   for i in range(len(terms) - 1))
+        def _discontiguous():
+            terms = self._span()
+            return any(terms[i].position + 1 != terms[i + 1].position
+                       for i in range(len(terms) - 1))
+
+        return self.layer._frozen_value(('discontiguous', id(self)),
+                                        _discontiguous)
 
     def get_sequences(self):
-        if self.attrib.get('implicit'):
+        if self._attrib._flags & core.IMPLICIT_FLAG:
             return []
-        pos = sorted([x.position for x in self.get_terminals()])
+        pos = [x.position for x in self._span()]
 
         # all terminals which end a sequence, including the last one
         seq_closers = [pos[i] for i in range(len(pos) - 1)
@@ -345,10 +446,11 @@ class FoundationalNode(core.Node):
 
     def to_text(self):
         """Returns the text in the span of self, separated by spaces."""
-        return ' '.join(t.text for t in self.get_terminals())
+        return ' '.join(t.text for t in self._span())
 
     def is_scene(self):
-        return (self.state is not None or self.process is not None)
+        by_tag = self._edges_by_tag()
+        return EdgeTags.State in by_tag or EdgeTags.Process in by_tag
 
     def str_sequences(self):
         """Returns a list of stringified sequences and positions of this FNode.
@@ -366,41 +468,298 @@ class FoundationalNode(core.Node):
             pass
 
     def __str__(self):
-        start = lambda x: (x.position if x.layer.ID == layer0.LAYER_ID else
-                           x.start_position)
-        end = lambda x: (x.position if x.layer.ID == layer0.LAYER_ID else
-                         x.end_position)
-        sorted_edges = sorted(list(self), key=lambda edge: start(edge.child))
-        output = ''
-        for i, edge in enumerate(sorted_edges):
+        return _render(self, {})
+
+    def _str(self, rendered):
+        """Returns str(self), given the str() of the FNodes below it.
+
+        Args:
+            rendered: the str() of each FNode child of self, by its id()
+
+        """
+        edges = []
+        for edge in self._outgoing:
+            node = edge.child
+            if node.layer.ID == layer0.LAYER_ID:
+                edges.append((node.position, node.position, edge))
+            else:
+                edges.append((node.start_position, node.end_position, edge))
+        edges.sort(key=operator.itemgetter(0))
+        end_position = self.end_position
+        output = []
+        for i, (start, end, edge) in enumerate(edges):
             node = edge.child
             if edge.tag == EdgeTags.Terminal:
-                space = ' ' if not end(node) == self.end_position else ''
-                output += '{}{}'.format(str(node), space)
+                space = ' ' if not end == end_position else ''
+                output.append('{}{}'.format(str(node), space))
             else:
                 edge_tag = edge.tag
-                if edge.attrib.get('remote'):
+                if edge._attrib._flags & core.REMOTE_FLAG:
                     edge_tag = edge_tag + '*'
-                if edge.attrib.get('uncertain'):
+                if edge._attrib._flags & core.UNCERTAIN_FLAG:
                     edge_tag = edge_tag + '?'
-                if start(node) == -1:
-                    output += "[{} IMPLICIT] ".format(edge_tag)
+                if start == -1:
+                    output.append("[{} IMPLICIT] ".format(edge_tag))
                 else:
-                    output += "[{} {}] ".format(edge_tag, str(node))
-            if (start(node) != -1 and not edge.attrib.get('remote')
-                    and i + 1 < len(sorted_edges)
-                    and end(node) + 1 < start(sorted_edges[i + 1].child)):
-                output += "... "  # adding '...' if discontiguous
-        return output
+                    text = (rendered[id(node)] if id(node) in rendered
+                            else str(node))
+                    output.append("[{} {}] ".format(edge_tag, text))
+            if (start != -1 and not edge._attrib._flags & core.REMOTE_FLAG
+                    and i + 1 < len(edges) and end + 1 < edges[i + 1][0]):
+                output.append("... ")  # adding '...' if discontiguous
+        return ''.join(output)
 
     def get_top_scene(self):
         """Returns the top-level scene this FNode is within, or None"""
-        if self in self.layer.top_scenes:
-            return self
-        elif self.fparent is None:
+        layer = self.layer
+        if layer._frozen_values is not None:
+            return layer._frozen_value('top_scene',
+                                       layer._top_scene_map)[id(self)]
+        node = self
+        while node is not None:
+            if id(node) in layer._scenes:
+                return node
+            node = node.fparent
+        return None
+
+
+def _render(fnode, rendered):
+    """Returns str(fnode), rendering each FNode below it only once.
+
+    The FNodes are rendered bottom-up, so each uses the strings of its
+    children instead of rendering them again. FNodes with no Terminals in
+    their span are shown as IMPLICIT by their parents, so they (and the
+    Nodes below them) are not rendered.
+
+    Args:
+        fnode: the FoundationalNode to render
+        rendered: the str() of FNodes already rendered, by their id(). The
+            strings of fnode and the FNodes below it are added to it.
+
+    """
+    stack = [(fnode, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if id(node) in rendered:
+            continue
+        if children_done:
+            rendered[id(node)] = node._str(rendered)
+            continue
+        stack.append((node, True))
+        stack.extend((edge.child, False) for edge in node._outgoing
+                     if isinstance(edge.child, FoundationalNode) and
+                     id(edge.child) not in rendered and
+                     edge.child.start_position != -1)
+    return rendered[id(fnode)]
+
+
+class _MinimumTable:
+    """Sparse table for finding the minimum of any range of a fixed list.
+
+    Takes O(n log n) time and space to build, and O(1) time for a query.
+
+    """
+
+    def __init__(self, values):
+        self.values = values
+        # _rows[k][i] is the index of the minimum among the 2 ** k values
+        # which start at index i
+        self._rows = [list(range(len(values)))]
+        width = 1
+        while 2 * width <= len(values):
+            prev = self._rows[-1]
+            self._rows.append([
+                prev[i] if values[prev[i]] <= values[prev[i + width]]
+                else prev[i + width]
+                for i in range(len(values) - 2 * width + 1)])
+            width *= 2
+
+    def argmin(self, start, stop):
+        """Returns the index of the minimum in values[start:stop]."""
+        level = (stop - start).bit_length() - 1
+        row = self._rows[level]
+        first, second = row[start], row[stop - (1 << level)]
+        return first if self.values[first] <= self.values[second] else second
+
+    def report(self, start, stop, bound):
+        """Returns the indices in range(start, stop) whose value <= bound.
+
+        Takes time proportional to the number of indices returned, as each
+        minimum found either splits the range or ends the search in it.
+
+        """
+        found = []
+        ranges = [(start, stop)]
+        while ranges:
+            start, stop = ranges.pop()
+            if start >= stop:
+                continue
+            i = self.argmin(start, stop)
+            if self.values[i] > bound:
+                continue
+            found.append(i)
+            ranges.append((start, i))
+            ranges.append((i + 1, stop))
+        return found
+
+
+class _SpanIndex:
+    """Index of the Terminal positions spanned by the FNodes of a Layer1.
+
+    Each FNode with Terminals is represented by the ranges of its
+    sequences (see :meth:FoundationalNode.get_sequences) for covering and
+    overlapping queries, and by its whole span for containment queries.
+    The ranges are sorted by their start, so the ranges which start before
+    (or after) a position are found by binary search, and the ones among
+    them which end after (or before) another are reported using a
+    :class:_MinimumTable of the ends (negated for the maximal end).
+
+    """
+
+    def __init__(self, layer):
+        sequences, spans = [], []
+        for node in layer._all:
+            if (node.tag != NodeTags.Foundational or
+                    node._attrib._flags & core.IMPLICIT_FLAG or
+                    not node._span()):
+                continue
+            spans.append((node.start_position, node.end_position, node))
+            sequences.extend((start, end, node)
+                             for start, end in node.get_sequences())
+        sequences.sort(key=operator.itemgetter(0))
+        spans.sort(key=operator.itemgetter(0))
+        self._order = layer._orderkey
+        self._sequences = sequences
+        self._sequence_starts = [start for start, _, _ in sequences]
+        self._latest_end = _MinimumTable([-end for _, end, _ in sequences])
+        self._spans = spans
+        self._span_starts = [start for start, _, _ in spans]
+        self._earliest_end = _MinimumTable([end for _, end, _ in spans])
+
+    def _nodes(self, entries, indices):
+        """Returns the distinct FNodes of the entries, in Layer order."""
+        nodes = {id(entries[i][2]): entries[i][2] for i in indices}
+        return sorted(nodes.values(), key=self._order)
+
+    def covering(self, start, end):
+        stop = bisect.bisect_right(self._sequence_starts, start)
+        return self._nodes(self._sequences,
+                           self._latest_end.report(0, stop, -end))
+
+    def overlapping(self, start, end):
+        stop = bisect.bisect_right(self._sequence_starts, end)
+        return self._nodes(self._sequences,
+                           self._latest_end.report(0, stop, -start))
+
+    def contained_in(self, start, end):
+        first = bisect.bisect_left(self._span_starts, start)
+        return self._nodes(self._spans,
+                           self._earliest_end.report(first, len(self._spans),
+                                                     end))
+
+
+class _AncestorIndex:
+    """Index of the FNode tree of :class:Layer1, for ancestry queries.
+
+    The tree is made of the Edges from FNodes to their children in the Layer,
+    ignoring remote Edges, so each Node has at most one parent (its fparent,
+    the parent of its first such incoming Edge). An Euler tour of the trees
+    gives each Node entry and exit times, so ancestry is checked by interval
+    containment, and the lowest common ancestor is the shallowest Node in
+    the tour between the two Nodes, found with a sparse table.
+
+    All Nodes are keyed by their id(), like the heads of core.Layer.
+
+    """
+
+    def __init__(self, layer):
+        fedges = {}
+        children = {id(node): [] for node in layer._all}
+        for node in layer._all:
+            fedges[id(node)] = None
+            for edge in node._incoming:
+                parent = edge.parent
+                if (id(parent) in children and
+                        parent.tag == NodeTags.Foundational and
+                        not edge._attrib._flags & core.REMOTE_FLAG):
+                    fedges[id(node)] = edge
+                    children[id(parent)].append(node)
+                    break
+        self._fedges = fedges
+        self._nearest = {}  # tag: nearest ancestor with this ftag, by node
+
+        # The Euler tour of each tree, one after the other
+        self._entry, self._exit, self._depth, self._tree = {}, {}, {}, {}
+        self._preorder = []
+        tour, depths = [], []
+        for root in layer._all:
+            if fedges[id(root)] is not None:
+                continue
+            self._visit(root, 0, root, tour, depths)
+            stack = [(root, iter(children[id(root)]))]
+            while stack:
+                node, remaining = stack[-1]
+                child = next(remaining, None)
+                if child is None:
+                    stack.pop()
+                    self._exit[id(node)] = len(tour) - 1
+                    if stack:
+                        tour.append(stack[-1][0])
+                        depths.append(len(stack) - 1)
+                else:
+                    self._visit(child, len(stack), root, tour, depths)
+                    stack.append((child, iter(children[id(child)])))
+        self._tour = tour
+        self._shallowest = _MinimumTable(depths)
+
+    def _visit(self, node, depth, root, tour, depths):
+        """Enters the node in the Euler tour."""
+        self._entry[id(node)] = len(tour)
+        self._depth[id(node)] = depth
+        self._tree[id(node)] = root
+        self._preorder.append(node)
+        tour.append(node)
+        depths.append(depth)
+
+    def fedge(self, node):
+        return self._fedges[id(node)]
+
+    def depth(self, node):
+        return self._depth[id(node)]
+
+    def is_ancestor(self, node, other):
+        return (self._entry[id(node)] < self._entry[id(other)] and
+                self._exit[id(other)] <= self._exit[id(node)])
+
+    def lca(self, node, other):
+        if self._tree[id(node)] is not self._tree[id(other)]:
             return None
-        else:
-            return self.fparent.get_top_scene()
+        start, end = sorted((self._entry[id(node)], self._entry[id(other)]))
+        return self._tour[self._shallowest.argmin(start, end + 1)]
+
+    def ancestors_with_tag(self, node, tag):
+        if tag not in self._nearest:
+            # Parents come before their children in the pre-order
+            nearest = {}
+            for child in self._preorder:
+                edge = self._fedges[id(child)]
+                if edge is None:
+                    nearest[id(child)] = None
+                    continue
+                parent = edge.parent
+                pedge = self._fedges[id(parent)]
+                if pedge is not None and pedge.tag == tag:
+                    nearest[id(child)] = parent
+                else:
+                    nearest[id(child)] = nearest[id(parent)]
+            self._nearest[tag] = nearest
+        nearest = self._nearest[tag]
+        ancestors = []
+        node = nearest[id(node)]
+        while node is not None:
+            ancestors.append(node)
+            node = nearest[id(node)]
+        return ancestors
 
 
 class Layer1(core.Layer):
@@ -411,31 +770,117 @@ class Layer1(core.Layer):
     def __init__(self, root, attrib=None, *, orderkey=core.id_orderkey):
         super().__init__(ID=LAYER_ID, root=root, attrib=attrib,
                          orderkey=orderkey)
-        self._scenes = []
-        self._linkages = []
+        # Top scenes and linkages, and the scene FNodes, all by id()
+        self._scenes = {}
+        self._linkages = {}
+        self._scene_nodes = {}
+        # Indexes built on the first query after the Layer has changed
+        self._ancestors = None  # _AncestorIndex
+        self._spans = None  # _SpanIndex
+        self._last_id = 0  # the unique ID part of the last allocated ID
         self._head_fnode = FoundationalNode(root=root,
                                             tag=NodeTags.Foundational,
                                             ID=self.next_id())
-        self._all = [self._head_fnode]
-        self._heads = [self._head_fnode]
 
     @property
     def top_scenes(self):
-        return self._scenes[:]
+        return sorted(self._scenes.values(), key=self._orderkey)
 
     @property
     def top_linkages(self):
-        return self._linkages[:]
+        return sorted(self._linkages.values(), key=self._orderkey)
+
+    def _ancestor_index(self):
+        """Returns the index of the FNode tree, building it if needed.
+
+        In bulk mode the Layer isn't updated on changes, so the index is
+        built for each call and isn't kept.
+
+        """
+        if self._root._bulk:
+            return _AncestorIndex(self)
+        if self._ancestors is None:
+            self._ancestors = _AncestorIndex(self)
+        return self._ancestors
+
+    def _span_index(self):
+        """Returns the index of the FNodes' spans, building it if needed."""
+        if self._root._bulk:
+            return _SpanIndex(self)
+        if self._spans is None:
+            self._spans = _SpanIndex(self)
+        return self._spans
+
+    def _clear_indexes(self):
+        """Drops the indexes built for queries, as the Layer has changed."""
+        self._ancestors = None
+        self._spans = None
+
+    def render(self, fnodes=None):
+        """Returns the str() of many FNodes, rendering each FNode once.
+
+        Args:
+            fnodes: the FoundationalNode objects to render, defaults to all
+                FNodes in the Layer (in the Layer order)
+
+        Returns:
+            a list of strings, the str() of each of fnodes
+
+        """
+        if fnodes is None:
+            fnodes = [node for node in self.all
+                      if isinstance(node, FoundationalNode)]
+        rendered = {}
+        return [_render(fnode, rendered) for fnode in fnodes]
+
+    def covering(self, start, end=None):
+        """Returns the FNodes whose span covers the given positions.
+
+        The positions must be all within one of the sequences of the FNode
+        (see :meth:FoundationalNode.get_sequences), so discontiguous FNodes
+        don't cover positions in their gaps.
+
+        Like the other span queries, the FNodes are returned in the Layer
+        order, and the query takes O(log n + k) time for n FNodes and k
+        sequences found, after an index of all spans is built on the first
+        query since the Layer was changed. Implicit FNodes (which have no
+        Terminals) are never returned.
+
+        Args:
+            start: the first Terminal position
+            end: the last Terminal position, defaults to start
+
+        Returns:
+            a list of FoundationalNode objects
+
+        """
+        return self._span_index().covering(start, start if end is None
+                                           else end)
+
+    def contained_in(self, start, end):
+        """Returns the FNodes whose whole span is within start and end."""
+        return self._span_index().contained_in(start, end)
+
+    def overlapping(self, start, end):
+        """Returns the FNodes with any of their sequences in start to end."""
+        return self._span_index().overlapping(start, end)
 
     def next_id(self):
-        """Returns the next avilable ID string for this layer."""
-        n = len(self._all) + 1
+        """Returns the next avilable ID string for this layer.
+
+        IDs are allocated in increasing order and never reused, even after
+        their Nodes are removed. IDs of Nodes which were created with a given
+        ID (e.g. by converters) are skipped, by looking them up in the Node
+        IDs of the Passage.
+
+        """
+        nodes = self._root._nodes
         while True:
-            ID = "{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR, n)
-            if ID not in self._all:
+            self._last_id += 1
+            ID = "{}{}{}".format(LAYER_ID, core.Node.ID_SEPARATOR,
+                                 self._last_id)
+            if ID not in nodes:
                 return ID
-            else:
-                n = n + 1
 
     def add_fnode(self, parent, edge_tag, *, implicit=False):
         """Adds a new :class:FNode whose parent and Edge tag are given.
@@ -452,14 +897,37 @@ class Layer1(core.Layer):
         Raises:
             core.FrozenPassageError if the Passage is frozen
 
+        """
+        return self.add_fnodes(parent, [edge_tag], implicit=implicit)[0]
+
+    def add_fnodes(self, parent, edge_tags, *, implicit=False):
+        """Adds new FNodes under the same parent, one for each Edge tag.
+
+        Like calling :meth:add_fnode for each tag.
+
+        Args:
+            parent: the parent FNode, or None for the layer head FNode
+            edge_tags: the tags of the Edges from parent to the new FNodes
+            implicit: whether to set the new FNodes as implicit
+
+        Returns:
+            a list of the newly created FNodes, in the order of edge_tags
+
+        Raises:
+            core.FrozenPassageError if the Passage is frozen
+
         """
         if parent is None:
             parent = self._head_fnode
-        node_attrib = {'implicit': True} if implicit else {}
-        fnode = FoundationalNode(root=self.root, tag=NodeTags.Foundational,
-                                 ID=self.next_id(), attrib=node_attrib)
-        parent.add(edge_tag, fnode)
-        return fnode
+        node_attrib = {'implicit': True} if implicit else None
+        root = self._root
+        fnodes = []
+        for edge_tag in edge_tags:
+            fnode = FoundationalNode(root=root, tag=NodeTags.Foundational,
+                                     ID=self.next_id(), attrib=node_attrib)
+            parent.add(edge_tag, fnode)
+            fnodes.append(fnode)
+        return fnodes
 
     def add_remote(self, parent, edge_tag, child):
         """Adds a new :class:core.Edge with remote attribute between the nodes.
@@ -489,14 +957,37 @@ class Layer1(core.Layer):
         Raises:
             core.FrozenPassageError if the Passage is frozen.
 
+        """
+        return self.add_puncts(parent, [terminal])[0]
+
+    def add_puncts(self, parent, terminals):
+        """Adds a PunctNode under parent for each of the Terminals.
+
+        Like calling :meth:add_punct for each Terminal.
+
+        Args:
+            parent: the parent of the new PunctNodes, or None for the layer
+                head FNode
+            terminals: the punctuation Terminals, one for each PunctNode
+
+        Returns:
+            a list of the newly created PunctNodes, in the order of terminals
+
+        Raises:
+            core.FrozenPassageError if the Passage is frozen.
+
         """
         if parent is None:
             parent = self._head_fnode
-        punct_node = PunctNode(root=self.root, tag=NodeTags.Punctuation,
-                               ID=self.next_id())
-        parent.add(EdgeTags.Punctuation, punct_node)
-        punct_node.add(EdgeTags.Terminal, terminal)
-        return punct_node
+        root = self._root
+        punct_nodes = []
+        for terminal in terminals:
+            punct_node = PunctNode(root=root, tag=NodeTags.Punctuation,
+                                   ID=self.next_id())
+            parent.add(EdgeTags.Punctuation, punct_node)
+            punct_node.add(EdgeTags.Terminal, terminal)
+            punct_nodes.append(punct_node)
+        return punct_nodes
 
     def add_linkage(self, relation, *args):
         """Adds a Linkage between the link relation and the linked arguments.
@@ -521,53 +1012,220 @@ class Layer1(core.Layer):
             linkage.add(EdgeTags.LinkArgument, arg)
         return linkage
 
-    def _check_top_scene(self, node):
-        """Checks whether a node is a scene, and a top-level one.
+    def copy(self, other_passage):
+        """Creates a copied Layer1 object and its Nodes in other_passage.
 
-        A top level scene is one which is not embedded in any other scene.
+        The Nodes and Edges are created in bulk mode, so the top scenes and
+        linkages are computed once, in the end. Edges to Nodes of other
+        Layers (Terminals) are copied only if other_passage has Nodes with
+        the same IDs, i.e. if these Layers were already copied to it.
 
         Args:
-            node: the FNode to check.
+            other_passage: the Passage to copy self to
 
         Returns:
-            True iff node is a top-level scenes.
+            the new Layer1 object
 
         """
-        if not node.is_scene():
-            return False
-        while node.fparent not in (None, self._head_fnode):
-            node = node.fparent
-            if node.is_scene():
-                return False
-        return True
+        with other_passage.bulk():
+            other = Layer1(root=other_passage, attrib=self.attrib.copy(),
+                           orderkey=self._orderkey)
+            other.extra = self.extra.copy()
+            # The copies by the id() of the original Nodes
+            copies = {id(self._head_fnode): other._head_fnode}
+            for key, value in self._head_fnode.attrib.items():
+                other._head_fnode.attrib[key] = value
+            for node in self._all:
+                if node is not self._head_fnode:
+                    copies[id(node)] = type(node)(
+                        ID=node.ID, root=other_passage, tag=node.tag,
+                        attrib=node._attrib, orderkey=node._orderkey)
+            nodes = other_passage._nodes
+            for node in self._all:
+                copied = copies[id(node)]
+                if node._extra:
+                    copied.extra = node._extra.copy()
+                for edge in node._outgoing:
+                    child = (copies.get(id(edge.child)) or
+                             nodes.get(edge.child.ID))
+                    if child is not None:
+                        new_edge = copied.add(edge.tag, child,
+                                              edge_attrib=edge._attrib)
+                        if edge._extra:
+                            new_edge.extra = edge._extra.copy()
+        return other
+
+    def _top_scene_map(self):
+        """Returns the top scene each Node is within (or None), by id()."""
+        index = self._ancestor_index()
+        top_scenes = {}
+        for node in index._preorder:  # parents come before their children
+            if id(node) in self._scenes:
+                top_scenes[id(node)] = node
+            else:
+                edge = index.fedge(node)
+                top_scenes[id(node)] = (None if edge is None else
+                                        top_scenes[id(edge.parent)])
+        return top_scenes
+
+    def _scene_weight(self, node):
+        """Returns 1 if node counts as a scene above other Nodes, else 0.
+
+        The Passage head is never counted, so the scenes right under it can
+        be top-level.
+
+        """
+        return int(id(node) in self._scene_nodes and
+                   node is not self._head_fnode)
+
+    def _fedge_of(self, node):
+        """Returns the Edge from the fparent of a Node in the Layer, or None.
+
+        Like :meth:FoundationalNode._fedge, but for any Node of the Layer.
 
-    def _update_top_scene(self, node):
-        """Adds/removes the node if it's a top-level scene."""
+        """
+        for edge in node._incoming:
+            if (id(edge.parent) in self._indegree and
+                    edge.parent.tag == NodeTags.Foundational and
+                    not edge._attrib._flags & core.REMOTE_FLAG):
+                return edge
+        return None
+
+    def _fchildren(self, node):
+        """Returns the Nodes in the Layer whose fparent is node."""
         if node.tag != NodeTags.Foundational:
+            return []
+        return [edge.child for edge in node._outgoing
+                if id(edge.child) in self._indegree and
+                self._fedge_of(edge.child) is edge]
+
+    def _scene_above(self, node):
+        """Returns whether a scene FNode is above node, following fparents."""
+        edge = self._fedge_of(node)
+        while edge is not None:
+            if self._scene_weight(edge.parent):
+                return True
+            edge = self._fedge_of(edge.parent)
+        return False
+
+    def _compute_scenes(self):
+        """Computes the scene FNodes and the top scenes.
+
+        A top-level scene is a scene (an FNode with a Process or a State)
+        which is not embedded in any other scene, i.e. no scene FNode is
+        above it when following the fparents (except the Passage head).
+
+        """
+        self._scene_nodes = {id(node): node for node in self._all
+                             if node.tag == NodeTags.Foundational and
+                             node.is_scene()}
+        self._scenes = {}
+        # Nodes with whether a scene is above them, from the FNode tree roots
+        stack = [(node, False) for node in self._all
+                 if self._fedge_of(node) is None]
+        while stack:
+            node, covered = stack.pop()
+            if id(node) in self._scene_nodes and not covered:
+                self._scenes[id(node)] = node
+            covered = covered or bool(self._scene_weight(node))
+            stack.extend((child, covered) for child in self._fchildren(node))
+
+    def _set_top_scene(self, node, is_top):
+        """Adds/removes the node as a top scene, updating its linkages."""
+        if is_top == (id(node) in self._scenes):
             return
-        if node in self._scenes and not self._check_top_scene(node):
-            self._scenes.remove(node)
-        elif node not in self._scenes and self._check_top_scene(node):
-            self._scenes.append(node)
-            # Other scenes may now become not top-level, check it
-            for ts in self._scenes[:-1]:
-                if not self._check_top_scene(ts):
-                    self._scenes.remove(ts)
-            self._scenes.sort(key=self.orderkey)
+        if is_top:
+            self._scenes[id(node)] = node
+        else:
+            del self._scenes[id(node)]
+        for edge in node._incoming:
+            if edge.parent.tag == NodeTags.Linkage:
+                self._update_top_linkage(edge.parent)
+
+    def _update_top_scenes(self, node, changed=False):
+        """Updates the top scenes at and below a changed Node.
+
+        Below node, the update stops at scene FNodes, since the Nodes below
+        them have a scene above them either way.
+
+        Args:
+            node: the Node whose place in the FNode tree changed
+            changed: whether node itself became or stopped being a scene, so
+                the Nodes below it are updated even if it's a scene now
+
+        """
+        stack = [(node, self._scene_above(node))]
+        while stack:
+            curr, covered = stack.pop()
+            self._set_top_scene(curr,
+                                id(curr) in self._scene_nodes and not covered)
+            weight = self._scene_weight(curr)
+            if not weight or (changed and curr is node):
+                stack.extend((child, covered or bool(weight))
+                             for child in self._fchildren(curr))
+
+    def _update_scene_node(self, node):
+        """Updates whether node is a scene, and the top scenes accordingly."""
+        is_scene = node.tag == NodeTags.Foundational and node.is_scene()
+        if is_scene == (id(node) in self._scene_nodes):
+            return
+        if is_scene:
+            self._scene_nodes[id(node)] = node
+        else:
+            del self._scene_nodes[id(node)]
+        self._update_top_scenes(node, changed=True)
+
+    def _update_scenes(self, edge):
+        """Updates the scenes after the Edge was added, removed or changed.
+
+        Only the parent can become (or stop being) a scene, which changes
+        the top scenes below it, and only the child can get a different
+        fparent, which changes the top scenes at and below it.
+
+        """
+        self._update_scene_node(edge.parent)
+        if id(edge.child) in self._indegree:
+            self._update_top_scenes(edge.child)
+
+    def _compute_linkages(self):
+        """Computes the top-level linkages from the top scenes."""
+        self._linkages = {}
+        for node in self._all:
+            if node.tag == NodeTags.Linkage:
+                self._update_top_linkage(node)
 
     def _update_top_linkage(self, linkage):
         """Adds/removes the linkage if it's a top level linkage."""
-        if all(fnode in self._scenes for fnode in linkage.arguments):
-            if linkage not in self._linkages:
-                self._linkages.append(linkage)
-                self._linkages.sort(key=self.orderkey)
-        elif linkage in self._linkages:
-            self._linkages.remove(linkage)
+        if linkage.tag == NodeTags.Linkage and all(
+                id(fnode) in self._scenes for fnode in
+                _multiple_children_by_tag(linkage, EdgeTags.LinkArgument)):
+            self._linkages[id(linkage)] = linkage
+        else:
+            self._linkages.pop(id(linkage), None)
+
+    def _invalidate_spans(self, node):
+        """Clears the kept Terminals of node and of the FNodes above it.
+
+        The Terminals of an FNode are computed from its children's, so when
+        an FNode has none kept, neither do the FNodes above it.
+
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, FoundationalNode):
+                if node._terminals is None:
+                    continue
+                node._terminals = None
+            stack.extend(edge.parent for edge in node._incoming
+                         if not edge._attrib._flags & core.REMOTE_FLAG)
 
     def _update_edge(self, edge):
         """Adds the Edge to the Layer, and updates top scenes and linkers."""
-        self._update_top_scene(edge.parent)
-        self._update_top_scene(edge.child)
+        self._invalidate_spans(edge.parent)
+        self._update_scenes(edge)
+        if edge.parent.tag == NodeTags.Linkage:  # its arguments changed
+            self._update_top_linkage(edge.parent)
         for lkg in [x for x in edge.parent.parents
                     if x.tag == NodeTags.Linkage]:
             self._update_top_linkage(lkg)
@@ -575,14 +1233,78 @@ class Layer1(core.Layer):
                     if x.tag == NodeTags.Linkage]:
             self._update_top_linkage(lkg)
 
+    def _refresh(self):
+        """Recomputes heads, order, top scenes and linkages in one pass."""
+        self._clear_indexes()
+        for node in self._all:
+            if isinstance(node, FoundationalNode):
+                node._terminals = None
+        super()._refresh()
+        self._sort()
+        self._compute_scenes()
+        self._compute_linkages()
+
     def _add_edge(self, edge):
+        self._clear_indexes()
         super()._add_edge(edge)
         self._update_edge(edge)
 
     def _remove_edge(self, edge):
+        self._clear_indexes()
         super()._remove_edge(edge)
         self._update_edge(edge)
 
     def _change_edge_tag(self, edge, old_tag):
+        self._clear_indexes()
         super()._change_edge_tag(edge, old_tag)
         self._update_edge(edge)
+
+    def _add_node(self, node):
+        self._clear_indexes()
+        super()._add_node(node)
+
+    def _remove_node(self, node):
+        self._clear_indexes()
+        for nodes in (self._scenes, self._linkages, self._scene_nodes):
+            nodes.pop(id(node), None)
+        super()._remove_node(node)
+
+    def _change_node_tag(self, node, old_tag):
+        self._clear_indexes()
+        super()._change_node_tag(node, old_tag)
+        if NodeTags.Foundational in (old_tag, node.tag):
+            # node may become a scene, and the fparent of its children
+            self._update_scene_node(node)
+            self._update_top_scenes(node, changed=True)
+            for child in node.children:
+                if id(child) in self._indegree:
+                    self._update_top_scenes(child)
+        self._update_top_linkage(node)
+
+    def _change_attribute(self, element, key):
+        if key in ('remote', 'implicit'):
+            self._clear_indexes()
+        if key == 'remote' and isinstance(element, core.Edge):
+            self._invalidate_spans(element.parent)
+            self._update_scenes(element)
+        super()._change_attribute(element, key)
+
+    def __getstate__(self):
+        # The indexes are keyed by the id() of the Nodes, rebuild if needed
+        state = super().__getstate__()
+        state['_ancestors'] = None
+        state['_spans'] = None
+        for key in ('_scenes', '_linkages', '_scene_nodes'):
+            state[key] = list(state[key].values())
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        for key in ('_scenes', '_linkages', '_scene_nodes'):
+            # no scene FNodes if pickled before they were kept, recomputed
+            # when the Passage is unpickled (see _refresh)
+            setattr(self, key, {id(node): node for node in state.get(key, ())})
+        if '_last_id' not in state:
+            self._ancestors = None
+            self._spans = None
+            self._last_id = 0  # IDs taken are skipped by next_id
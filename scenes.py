@@ -6,7 +6,27 @@ in the foundational layer of UCCA.
 """
 
 import re
-from ucca import layer0, layer1
+from ucca import core, layer0, layer1
+
+
+def extract_scenes(passage):
+    """Extracts all scenes (FNodes with a Process or a State) from a Passage.
+
+    Args:
+        passage: core.Passage object to extract scenes from
+
+    Returns:
+        a list of layer1.FoundationalNode objects, in the foundational layer
+        order
+
+    """
+    l1 = passage.layer(layer1.LAYER_ID)
+    scenes = {}
+    for tag in (layer1.EdgeTags.Process, layer1.EdgeTags.State):
+        for edge in l1.edges_by_tag(tag):
+            if edge.parent.tag == layer1.NodeTags.Foundational:
+                scenes[id(edge.parent)] = edge.parent
+    return sorted(scenes.values(), key=l1.orderkey)
 
 
 def extract_possible_scenes(passage):
@@ -27,13 +47,11 @@ def extract_possible_scenes(passage):
         a list of core.Node objects which are candidates for scenes
 
     """
-    l1 = passage.layer(layer1.LAYER_ID)
     ret = []
-    for scene in (x for x in l1.all if x.tag == layer1.NodeTags.Foundational
-                  and x.is_scene()):
+    for scene in extract_scenes(passage):
         for p in (e.child for e in scene
                   if e.tag == layer1.EdgeTags.Participant and
-                  not e.attrib.get('remote')):
+                  not e.attrib.flag(core.REMOTE_FLAG)):
             if p.is_scene() or (len(p.centers) == 1 and p.elaborators):
                 ret.append(p)
             else:  # if there are more than one center, add all of them
@@ -55,9 +73,15 @@ def extract_non_scenes_AGCE(passage):
     l1 = passage.layer(layer1.LAYER_ID)
     requested_tags = (layer1.EdgeTags.Participant, layer1.EdgeTags.Center,
                       layer1.EdgeTags.Elaborator, layer1.EdgeTags.Ground)
-    return [fnode for fnode in l1.all
-            if fnode.tag == layer1.NodeTags.Foundational and
-            fnode.ftag in requested_tags]
+    # every such FNode is the child of a non-remote Edge with its ftag
+    fnodes = {}
+    for tag in requested_tags:
+        for edge in l1.edges_by_tag(tag):
+            fnode = edge.child
+            if (fnode.tag == layer1.NodeTags.Foundational and
+                    fnode.ftag in requested_tags):
+                fnodes[id(fnode)] = fnode
+    return sorted(fnodes.values(), key=l1.orderkey)
 
 
 def extract_head(fnode):
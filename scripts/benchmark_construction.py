@@ -0,0 +1,74 @@
+#! /usr/bin/python3
+
+
+desc = """Measures the time it takes to construct passages of growing sizes.
+
+Each passage is built of a single core.Layer, whose Nodes form a tree with
+a fixed branching factor. For every size, the total construction time and the
+time per Node are printed; if construction is (near) linear in the number of
+Nodes, the time per Node should stay roughly constant as the size grows.
+
+"""
+
+import argparse
+import time
+
+from ucca import core
+
+
+def build_passage(num_nodes, branching):
+    """Creates a Passage with a single layer of num_nodes Nodes in a tree.
+
+    Args:
+        num_nodes: number of Nodes to create
+        branching: number of children each internal Node has
+
+    Returns:
+        the created core.Passage object
+
+    """
+    passage = core.Passage('1')
+    core.Layer('1', passage)
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = core.Node(ID='1.{}'.format(i), root=passage, tag='N')
+        if nodes:
+            nodes[(i - 2) // branching].add('E', node)
+        nodes.append(node)
+    return passage
+
+
+def time_construction(num_nodes, branching, repeat):
+    """Returns the best time (in seconds) of constructing such a Passage."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        passage = build_passage(num_nodes, branching)
+        # reading the ordered Nodes is part of any real usage
+        passage.layer('1').all
+        passage.layer('1').heads
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('sizes', nargs='*', type=int,
+                        default=[1000, 2000, 4000, 8000, 16000],
+                        help="number of Nodes in each measured Passage")
+    parser.add_argument('-b', '--branching', type=int, default=4,
+                        help="number of children for each internal Node")
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help="number of repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    print("{:>8} {:>12} {:>16}".format('nodes', 'total (s)', 'per node (us)'))
+    for size in args.sizes:
+        elapsed = time_construction(size, args.branching, args.repeat)
+        print("{:>8} {:>12.4f} {:>16.2f}".format(size, elapsed,
+                                                 elapsed / size * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#! /usr/bin/python3
+
+
+desc = """Measures the overhead of delivering mutation events of a Passage.
+
+The same passage (a single core.Layer whose Nodes form a tree, with an
+attribute set on each Edge) is built with no subscribers, with a subscriber
+for event types which are never created, and with one or more subscribers
+which receive all events and do nothing. The best construction time of each
+setting is printed, together with the overhead per event compared to
+building the passage without subscribers.
+
+"""
+
+import argparse
+import gc
+import time
+
+from ucca import core
+
+
+def _ignore(event):
+    pass
+
+
+def build_passage(num_nodes, branching, subscribers, event_types):
+    """Builds the passage after subscribing the given number of callbacks.
+
+    Returns:
+        the number of events created during construction
+
+    """
+    passage = core.Passage('1')
+    core.Layer('1', passage)
+    for _ in range(subscribers):
+        passage.subscribe(_ignore, *event_types)
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = core.Node(ID='1.{}'.format(i), root=passage, tag='N')
+        if nodes:
+            edge = nodes[(i - 2) // branching].add('E', node)
+            edge.attrib['remote'] = False
+        nodes.append(node)
+    # one NodeAdded for each Node, and EdgeAdded & AttributeChanged per Edge
+    return num_nodes + 2 * (num_nodes - 1)
+
+
+def time_construction(num_nodes, branching, repeat, subscribers,
+                      event_types=()):
+    """Returns the best time (in seconds) and the number of events."""
+    best = None
+    for _ in range(repeat):
+        # garbage collection of previous passages adds a lot of noise
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        events = build_passage(num_nodes, branching, subscribers, event_types)
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('-n', '--nodes', type=int, default=20000,
+                        help="number of Nodes in the measured Passage")
+    parser.add_argument('-b', '--branching', type=int, default=4,
+                        help="number of children for each internal Node")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="number of repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    settings = [('no subscribers', 0, ()),
+                ('filtered out', 1, (core.NodeTagChanged,)),
+                ('1 subscriber', 1, ()),
+                ('4 subscribers', 4, ())]
+    build_passage(args.nodes, args.branching, 0, ())  # warming up
+    base = None
+    print("{:>16} {:>12} {:>18}".format('setting', 'total (s)',
+                                        'per event (us)'))
+    for name, subscribers, event_types in settings:
+        elapsed, events = time_construction(args.nodes, args.branching,
+                                            args.repeat, subscribers,
+                                            event_types)
+        if base is None:
+            base = elapsed
+        print("{:>16} {:>12.4f} {:>18.3f}".format(
+            name, elapsed, (elapsed - base) / events * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#! /usr/bin/python3
+
+
+desc = """Measures the cost of checking for frozen Passages on each change.
+
+Every change of a Passage goes through core.ModifyPassage, which raises
+FrozenPassageError if the Passage is frozen. The current decorator (a plain
+function wrapping the method) is compared with the descriptor used before,
+which created a functools.partial on each attribute access and a wrapped
+inner function on each call, and with no check at all. Node.add and
+setting an Edge attribute are timed over the same passage (a single
+core.Layer whose Nodes form a tree), and the best time per call of each
+check is printed, together with the overhead compared to no check.
+
+"""
+
+import argparse
+import functools
+import gc
+import time
+
+from ucca import core
+
+
+class _OldModifyPassage:
+    """The previous core.ModifyPassage descriptor."""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __get__(self, obj, cls):
+        return functools.partial(self.__call__, obj)
+
+    def __call__(self, *args, **kwargs):
+        @functools.wraps(self.fn)
+        def decorated(*args, **kwargs):
+            if args[0].root.frozen:
+                raise core.FrozenPassageError()
+            return self.fn(*args, **kwargs)
+        return decorated(*args, **kwargs)
+
+
+_add = core.Node.add.__wrapped__
+_setitem = core._AttributeDict.__setitem__.__wrapped__
+
+
+class _OldNode(core.Node):
+    __slots__ = ()
+    add = _OldModifyPassage(_add)
+
+
+class _OldAttributeDict(core._AttributeDict):
+    __slots__ = ()
+    __setitem__ = _OldModifyPassage(_setitem)
+
+
+class _UncheckedNode(core.Node):
+    __slots__ = ()
+    add = _add
+
+
+class _UncheckedAttributeDict(core._AttributeDict):
+    __slots__ = ()
+    __setitem__ = _setitem
+
+
+# check name: (Node class, attributes class)
+CHECKS = {'current': (core.Node, core._AttributeDict),
+          'old': (_OldNode, _OldAttributeDict),
+          'none': (_UncheckedNode, _UncheckedAttributeDict)}
+
+
+def create_nodes(num_nodes, node_class):
+    """Returns the Nodes of a new passage, with no Edges."""
+    passage = core.Passage('1')
+    core.Layer('1', passage)
+    return [node_class(ID='1.{}'.format(i), root=passage, tag='N')
+            for i in range(1, num_nodes + 1)]
+
+
+def time_changes(num_nodes, branching, check):
+    """Returns the time (in seconds) of adding the Edges, setting attributes.
+
+    The passage has num_nodes - 1 Edges, so each is done that many times.
+
+    """
+    node_class, attrib_class = CHECKS[check]
+    nodes = create_nodes(num_nodes, node_class)
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    edges = [nodes[(i - 1) // branching].add('E', nodes[i])
+             for i in range(1, num_nodes)]
+    adding = time.perf_counter() - start
+    for edge in edges:
+        edge._attrib.__class__ = attrib_class
+    start = time.perf_counter()
+    for edge in edges:
+        edge.attrib['remote'] = False
+    setting = time.perf_counter() - start
+    gc.enable()
+    return adding, setting
+
+
+def main():
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('-n', '--nodes', type=int, default=20000,
+                        help="number of Nodes in the measured Passage")
+    parser.add_argument('-b', '--branching', type=int, default=4,
+                        help="number of children for each internal Node")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="number of repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    time_changes(args.nodes, args.branching, 'current')  # warming up
+    best = {}
+    for _ in range(args.repeat):
+        for check in CHECKS:
+            times = time_changes(args.nodes, args.branching, check)
+            best[check] = tuple(min(x) for x in zip(best.get(check, times),
+                                                    times))
+    calls = args.nodes - 1
+    print("{:>8} {:>14} {:>14} {:>16} {:>16}".format(
+        'check', 'add (us)', 'setitem (us)', 'add extra (us)',
+        'setitem extra (us)'))
+    for check, (adding, setting) in best.items():
+        print("{:>8} {:>14.3f} {:>14.3f} {:>16.3f} {:>16.3f}".format(
+            check, adding / calls * 1e6, setting / calls * 1e6,
+            (adding - best['none'][0]) / calls * 1e6,
+            (setting - best['none'][1]) / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main()
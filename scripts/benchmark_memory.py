@@ -0,0 +1,159 @@
+#! /usr/bin/python3
+
+
+desc = """Measures the memory used for each Node, Edge and Terminal.
+
+The current (slotted) classes are compared with the layout used before, in
+which each Node, Edge and attributes object had its own __dict__, and every
+Node and Edge eagerly allocated an empty attribute dictionary and an empty
+'extra' dictionary. The old layout is reproduced by minimal classes holding
+the same fields, kept in the same containers as a Passage and Layer keep
+their Nodes, so the reported numbers are bytes per object as traced by
+tracemalloc (including IDs, containers and the objects they own).
+
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from ucca import core, layer0
+
+
+class _DictAttributes:
+    """Old layout of core._AttributeDict."""
+
+    def __init__(self, root, mapping=None):
+        self._root = root
+        self._dict = mapping.copy() if mapping is not None else dict()
+
+
+class _DictEdge:
+    """Old layout of core.Edge."""
+
+    def __init__(self, root, tag, parent, child, attrib=None):
+        self._tag = tag
+        self._root = root
+        self._parent = parent
+        self._child = child
+        self._attrib = _DictAttributes(root, attrib)
+        self.extra = {}
+
+
+class _DictNode:
+    """Old layout of core.Node (and layer0.Terminal)."""
+
+    def __init__(self, ID, root, tag, attrib=None):
+        self._tag = tag
+        self._root = root
+        self._ID = ID
+        self._attrib = _DictAttributes(root, attrib)
+        self.extra = {}
+        self._outgoing = []
+        self._incoming = []
+        self._orderkey = core.edge_id_orderkey
+
+
+class _DictPassage:
+    """Holds _DictNode objects like a Passage and its Layer would."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.all = []
+        self.heads = []
+
+    def add(self, node):
+        self.nodes[node._ID] = node
+        self.all.append(node)
+        self.heads.append(node)
+
+
+def _parent_index(i, branching):
+    return (i - 2) // branching
+
+
+def build_current(num_nodes, branching, with_edges):
+    passage = core.Passage('1')
+    core.Layer('1', passage)
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = core.Node(ID='1.{}'.format(i), root=passage, tag='N')
+        if nodes and with_edges:
+            nodes[_parent_index(i, branching)].add('E', node)
+        nodes.append(node)
+    return passage
+
+
+def build_old(num_nodes, branching, with_edges):
+    passage = _DictPassage()
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = _DictNode(ID='1.{}'.format(i), root=passage, tag='N')
+        passage.add(node)
+        if nodes and with_edges:
+            parent = nodes[_parent_index(i, branching)]
+            edge = _DictEdge(passage, 'E', parent, node)
+            parent._outgoing.append(edge)
+            node._incoming.append(edge)
+            passage.heads.remove(node)
+        nodes.append(node)
+    return passage
+
+
+def build_current_terminals(num_terminals):
+    passage = core.Passage('1')
+    layer = layer0.Layer0(passage)
+    for i in range(num_terminals):
+        layer.add_terminal('word', False)
+    return passage
+
+
+def build_old_terminals(num_terminals):
+    passage = _DictPassage()
+    for i in range(1, num_terminals + 1):
+        passage.add(_DictNode(ID='0.{}'.format(i), root=passage,
+                              tag=layer0.NodeTags.Word,
+                              attrib={'text': 'word', 'paragraph': 1,
+                                      'paragraph_position': i}))
+    return passage
+
+
+def traced_size(build, *args):
+    """Returns the bytes allocated by build(*args) and still alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('-n', '--nodes', type=int, default=20000,
+                        help="number of Nodes (and Terminals) to create")
+    parser.add_argument('-b', '--branching', type=int, default=4,
+                        help="number of children for each internal Node")
+    args = parser.parse_args()
+
+    results = []
+    for name, build, build_terminals in (
+            ('old', build_old, build_old_terminals),
+            ('current', build_current, build_current_terminals)):
+        nodes = traced_size(build, args.nodes, args.branching, False)
+        graph = traced_size(build, args.nodes, args.branching, True)
+        terminals = traced_size(build_terminals, args.nodes)
+        results.append((name, nodes / args.nodes,
+                        (graph - nodes) / (args.nodes - 1),
+                        terminals / args.nodes))
+
+    print("{:>8} {:>10} {:>10} {:>10}".format('layout', 'node', 'edge',
+                                              'terminal'))
+    for name, node, edge, terminal in results:
+        print("{:>8} {:>10.1f} {:>10.1f} {:>10.1f}".format(name, node, edge,
+                                                           terminal))
+
+
+if __name__ == '__main__':
+    main()
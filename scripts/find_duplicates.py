@@ -0,0 +1,65 @@
+#! /usr/bin/python3
+
+
+desc = """Finds duplicate annotations in pickled Passages and DB files.
+
+The input are files of pickled Passages (either a single Passage or a list of
+them, as created by extract_all_passages.py), and/or site DB files, whose
+every XML in the xmls table is parsed. Passages are compared by their
+annotation only (not by their IDs), and each group of equivalent Passages is
+printed on a line, where each Passage is identified by its source file, its
+position/xml ID in the source and its Passage ID.
+
+"""
+
+import argparse
+import pickle
+import sqlite3
+import xml.etree.ElementTree as ETree
+
+from ucca import convert, util
+
+
+def read_pickle(filename):
+    """Yields (name, Passage) pairs of a pickled Passage(s) file."""
+    with open(filename, 'rb') as f:
+        passages = pickle.load(f)
+    if not isinstance(passages, (list, tuple)):
+        passages = [passages]
+    for i, passage in enumerate(passages):
+        yield "{}:{}:{}".format(filename, i, passage.ID), passage
+
+
+def read_db(filename):
+    """Yields (name, Passage) pairs of all XMLs in a DB file."""
+    conn = sqlite3.connect(filename)
+    c = conn.cursor()
+    c.execute("SELECT id, xml FROM xmls")
+    for xid, xml in c:
+        passage = convert.from_site(ETree.fromstring(xml))
+        yield "{}:{}:{}".format(filename, xid, passage.ID), passage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('filenames', nargs='*',
+                        help="files of pickled Passages")
+    parser.add_argument('-d', '--db', action='append', default=[],
+                        help="DB file to read all XMLs from, can be repeated")
+    args = parser.parse_args()
+    if not (args.filenames or args.db):
+        parser.error("Must specify at least one pickle or DB file")
+
+    sources = []
+    for filename in args.filenames:
+        sources.extend(read_pickle(filename))
+    for filename in args.db:
+        sources.extend(read_db(filename))
+
+    names = {id(passage): name for name, passage in sources}
+    for group in util.find_duplicates(passage for _, passage in sources):
+        print(' '.join(names[id(passage)] for passage in group))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,11 @@ import argparse
 import pickle
 import sys
 
-from ucca import scenes, convert, layer1
+from ucca import scenes, convert
 
 
 def get_noun_scene_heads(passage):
-    fnodes = [x for x in passage.layer(layer1.LAYER_ID).all
-              if x.tag == layer1.NodeTags.Foundational and x.is_scene()]
-    heads = [scenes.extract_head(x) for x in fnodes]
+    heads = [scenes.extract_head(x) for x in scenes.extract_scenes(passage)]
     noun_heads = [x for x in heads if x is not None and scenes.is_noun(x)]
     return noun_heads
 
@@ -133,6 +133,82 @@ class CoreTests(unittest.TestCase):
         self.assertEqual(node22.tag, 'x')
         self.assertEqual(node22[0].tag, 'testx')
 
+        # Frozen Passages can't be changed at all
+        p.frozen = True
+        for change in (lambda: p.attrib.__setitem__('x', 1),
+                       lambda: node13.attrib.__delitem__('node'),
+                       lambda: node22[0].attrib.__setitem__('remote', True),
+                       lambda: setattr(node22, 'tag', 'y'),
+                       lambda: setattr(node22[0], 'tag', 'testy'),
+                       lambda: node14.add('test', node13),
+                       lambda: node22.remove(node11),
+                       lambda: node14.destroy(),
+                       lambda: core.Node(ID='1.6', root=p, tag='6'),
+                       lambda: core.Layer(ID='3', root=p)):
+            self.assertRaises(core.FrozenPassageError, change)
+        self.assertEqual(node22.tag, 'x')
+        self.assertSequenceEqual(node22.children, [node11, node13])
+        p.frozen = False
+        node14.add('test', node13)
+        self.assertSequenceEqual(node14.children, [node13, node15])
+
+    def test_ordering(self):
+        p = self._create_basic_passage()
+        l1, l2 = p.layer('1'), p.layer('2')
+        node11, node12, node13 = l1.all
+
+        # Nodes are added in reverse order of their IDs
+        node16 = core.Node(ID='1.16', root=p, tag='6')
+        node15 = core.Node(ID='1.5', root=p, tag='5')
+        self.assertSequenceEqual(l1.all, [node11, node12, node13, node15,
+                                          node16])
+        self.assertSequenceEqual(l1.heads, [node12, node15, node16])
+        node15.add('', node16)
+        node15.add('', node13)
+        self.assertSequenceEqual([x.child for x in node15],
+                                 [node13, node16])
+        self.assertLess(core.edge_id_orderkey(node15[0]),
+                        core.edge_id_orderkey(node15[1]))
+        self.assertSequenceEqual(l1.heads, [node12, node15])
+        l1.orderkey = operator.attrgetter('tag')
+        self.assertSequenceEqual(l1.all, [node11, node13, node15, node16,
+                                          node12])
+        self.assertSequenceEqual(l1.heads, [node15, node12])
+        self.assertSequenceEqual([x.ID for x in l2.all], ['2.2', '2.1'])
+
+    def test_lazy_storage(self):
+        p = self._create_basic_passage()
+        node11 = p.by_id('1.1')
+        edge = node11.incoming[0]
+        for obj in (node11, edge):
+            self.assertFalse(hasattr(obj, '__dict__'))
+            self.assertEqual(len(obj.attrib), 0)
+            self.assertIsNone(obj.attrib.get('x'))
+            self.assertRaises(KeyError, obj.attrib.__getitem__, 'x')
+            obj.attrib['x'] = 1
+            self.assertEqual(obj.attrib['x'], 1)
+            self.assertDictEqual(obj.attrib.copy(), {'x': 1})
+            del obj.attrib['x']
+            self.assertEqual(len(obj.attrib), 0)
+            # Known boolean keys are kept as flags, with the same mapping API
+            obj.attrib['remote'] = False
+            obj.attrib['uncertain'] = True
+            self.assertIs(obj.attrib['remote'], False)
+            self.assertFalse(obj.attrib.flag(core.REMOTE_FLAG))
+            self.assertTrue(obj.attrib.flag(core.UNCERTAIN_FLAG))
+            self.assertDictEqual(obj.attrib.copy(),
+                                 {'remote': False, 'uncertain': True})
+            obj.attrib['uncertain'] = 'maybe'
+            self.assertEqual(obj.attrib['uncertain'], 'maybe')
+            self.assertTrue(obj.attrib.flag(core.UNCERTAIN_FLAG))
+            del obj.attrib['remote']
+            del obj.attrib['uncertain']
+            self.assertEqual(len(obj.attrib), 0)
+            self.assertFalse(obj.attrib._flags)
+            self.assertDictEqual(obj.extra, {})
+            obj.extra['y'] = 2
+            self.assertDictEqual(obj.extra, {'y': 2})
+
     def test_equals(self):
         p1 = core.Passage('1')
         p2 = core.Passage('2')
@@ -190,6 +266,123 @@ class CoreTests(unittest.TestCase):
         p1l2 = core.Layer('2', p1)
         self.assertFalse(p1.equals(p2) or p2.equals(p1))
 
+    def test_fingerprints(self):
+        p1 = self._create_basic_passage()
+        p2 = self._create_basic_passage()
+        node12 = p1.by_id('1.2')
+        self.assertEqual(p1.fingerprint, p2.fingerprint)
+        self.assertEqual(node12.fingerprint, p2.by_id('1.2').fingerprint)
+        self.assertNotEqual(node12.fingerprint, p1.by_id('1.1').fingerprint)
+        # Edge order doesn't matter, but anything in the subtree does
+        node12.orderkey = core.edge_id_orderkey
+        self.assertEqual(node12.fingerprint, p2.by_id('1.2').fingerprint)
+        p1.by_id('1.3').attrib['node'] = False
+        self.assertNotEqual(p1.fingerprint, p2.fingerprint)
+        self.assertNotEqual(node12.fingerprint, p2.by_id('1.2').fingerprint)
+        self.assertFalse(p1.equals(p2))
+        p1.by_id('1.3').attrib['node'] = 1  # equal to True
+        self.assertEqual(p1.fingerprint, p2.fingerprint)
+        self.assertTrue(p1.equals(p2))
+        # floats which aren't integers, including NaN and infinity
+        p1.by_id('1.3').attrib['node'] = float('inf')
+        self.assertNotEqual(p1.fingerprint, p2.fingerprint)
+        p2.by_id('1.3').attrib['node'] = float('inf')
+        self.assertEqual(p1.fingerprint, p2.fingerprint)
+        p1.by_id('1.3').attrib['node'] = float('nan')
+        p2.by_id('1.3').attrib['node'] = 1.5
+        self.assertNotEqual(p1.fingerprint, p2.fingerprint)
+
+    def test_events(self):
+        p = self._create_basic_passage()
+        node11, node12, node13 = p.layer('1').all
+        events, tag_events = [], []
+        p.subscribe(events.append)
+        p.subscribe(tag_events.append, core.NodeTagChanged,
+                    core.EdgeTagChanged)
+        node14 = core.Node(ID='1.4', root=p, tag='4')
+        edge = node14.add('test', node11)
+        edge.tag = 'test3'
+        edge.attrib['remote'] = True
+        node14.tag = '5'
+        node14.destroy()
+        self.assertSequenceEqual(events, [
+            core.NodeAdded(node14), core.EdgeAdded(edge),
+            core.EdgeTagChanged(edge, 'test'),
+            core.AttributeChanged(edge, 'remote', core.NO_VALUE, True),
+            core.NodeTagChanged(node14, '4'), core.EdgeRemoved(edge),
+            core.NodeRemoved(node14)])
+        self.assertSequenceEqual(tag_events, events[2:3] + events[4:5])
+        p.unsubscribe(events.append)
+        del node13.attrib['node']
+        self.assertEqual(len(events), 7)
+        self.assertRaises(ValueError, p.unsubscribe, events.append)
+
+    def test_indexes(self):
+        p = self._create_basic_passage()
+        l1, l2 = p.layer('1'), p.layer('2')
+        node11, node12, node13 = l1.all
+        node22, node21 = l2.all
+        self.assertSequenceEqual(l1.nodes_by_tag('x'), [node12])
+        self.assertSequenceEqual(l2.nodes_by_tag('2'), [node22, node21])
+        self.assertSequenceEqual(l2.edges_by_tag('test'),
+                                 [node22[0], node22[2], node21[0]])
+        self.assertSequenceEqual(l1.edges_by_tag('test'), [])
+
+        # the indexes are built on demand and dropped on changes
+        self.assertIsNotNone(l1._indexes)
+        node12.tag = 'y'
+        self.assertIsNone(l1._indexes)
+        node21[0].tag = 'test3'
+        node22[0].attrib['remote'] = True
+        node11.attrib['implicit'] = True
+        self.assertSequenceEqual(l1.nodes_by_tag('x'), [])
+        self.assertSequenceEqual(l1.nodes_by_tag('y'), [node12])
+        self.assertSequenceEqual(l2.edges_by_tag('test3'), [node21[0]])
+        self.assertSequenceEqual(l2.remote_edges, [node22[0]])
+        self.assertSequenceEqual(l1.implicit_nodes, [node11])
+        node22[0].attrib['remote'] = False
+        node11.destroy()
+        self.assertSequenceEqual(l2.remote_edges, [])
+        self.assertSequenceEqual(l1.implicit_nodes, [])
+        self.assertSequenceEqual(l2.edges_by_tag('test'), [node22[1]])
+
+        with p.bulk():
+            node12.tag = 'x'
+            node22[0].attrib['remote'] = True
+        self.assertSequenceEqual(l1.nodes_by_tag('x'), [node12])
+        self.assertSequenceEqual(l2.remote_edges, [node22[0]])
+
+        # changes to other Layers keep the indexes, and queries in bulk
+        # mode see the changes done in it
+        node_tags = l1._tag_indexes()[0]
+        node22.tag = '3'
+        node22[1].attrib['remote'] = True
+        self.assertIs(l1._tag_indexes()[0], node_tags)
+        with p.bulk():
+            node12.tag = 'y'
+            self.assertSequenceEqual(l1.nodes_by_tag('x'), [])
+            node12.tag = 'x'
+            self.assertSequenceEqual(l1.nodes_by_tag('x'), [node12])
+            self.assertSequenceEqual(l2.nodes_by_tag('3'), [node22])
+
+    def test_tag_codes(self):
+        p = self._create_basic_passage()
+        l1, l2 = p.layer('1'), p.layer('2')
+        for node in l1.all + l2.all:
+            self.assertEqual(core.code_tag(node.tag_code), node.tag)
+            for edge in node:
+                self.assertEqual(core.code_tag(edge.tag_code), edge.tag)
+        self.assertEqual(core.tag_code(layer1.EdgeTags.Process),
+                         core.tag_code(layer1.EdgeTags.Process))
+        self.assertNotEqual(core.tag_code(layer1.EdgeTags.Process),
+                            core.tag_code(layer1.EdgeTags.State))
+        self.assertSequenceEqual(l2.tag_codes().tolist(),
+                                 [x.tag_code for x in l2.all])
+        self.assertSequenceEqual(
+            l2.edge_tag_codes().tolist(),
+            [e.tag_code for x in l2.all for e in x])
+        self.assertTrue(l2.tag_codes().readonly)
+
     def test_copying(self):
         # we don't need such a complex passage, but it will work anyway
         p1 = Layer1Tests._create_passage()
@@ -204,6 +397,28 @@ class CoreTests(unittest.TestCase):
         p2 = p1.copy([l0id])
         self.assertTrue(p1.layer(l0id).equals(p2.layer(l0id)))
 
+        l1id = layer1.LAYER_ID
+        p2 = p1.copy([l1id, l0id])
+        self.assertTrue(p1.equals(p2, ordered=True))
+        l1, l2 = p1.layer(l1id), p2.layer(l1id)
+        for attr in ('all', 'heads', 'top_scenes', 'top_linkages'):
+            self.assertSequenceEqual([x.ID for x in getattr(l1, attr)],
+                                     [x.ID for x in getattr(l2, attr)])
+        self.assertSequenceEqual([str(x) for x in l1.heads],
+                                 [str(x) for x in l2.heads])
+        l2.heads[0].destroy()
+        # Terminal.attrib is a copy, so change the attributes themselves
+        p2.layer(l0id).all[0]._attrib['text'] = 'changed'
+        self.assertEqual(len(l1.heads), 3)
+        self.assertNotEqual(p1.layer(l0id).all[0].text, 'changed')
+        self.assertEqual(p1.layer(l0id).all[0].attrib['text'], '1')
+
+        # Edges to Terminals are omitted when Layer0 isn't copied
+        p2 = p1.copy([l1id])
+        self.assertEqual(len(p2.layer(l1id).all), len(l1.all))
+        self.assertFalse(p2.layer(l1id).heads[0].get_terminals())
+        self.assertRaises(KeyError, p1.copy, ['2'])
+
     def test_iteration(self):
         p = self._create_basic_passage()
         l1, l2 = p.layer('1'), p.layer('2')
@@ -225,6 +440,20 @@ class CoreTests(unittest.TestCase):
                                                   duplicates=True)),
                                  [node22, node11, node12, node13, node13,
                                   node11])
+        self.assertSequenceEqual(list(node22.iter(method='postorder')),
+                                 [node11, node13, node12, node22])
+        self.assertSequenceEqual(list(node22.iter(method='postorder',
+                                                  duplicates=True)),
+                                 [node11, node13, node11, node12, node13,
+                                  node22])
+        self.assertSequenceEqual(list(node21.iter(depth=True)),
+                                 [(0, node21), (1, node11), (1, node12),
+                                  (2, node13)])
+        self.assertSequenceEqual(list((d, x.ID) for d, x in node22.iter(
+            obj='edges', method='postorder', depth=True)),
+            [(1, '2.2->1.1'), (2, '1.2->1.3'), (2, '1.2->1.1'),
+             (1, '2.2->1.2'), (1, '2.2->1.3')])
+        self.assertRaises(ValueError, list, node11.iter(method='inorder'))
 
 
 class Layer0Tests(unittest.TestCase):
@@ -286,6 +515,38 @@ class Layer0Tests(unittest.TestCase):
         self.assertSequenceEqual([x[0] for x in l0.pairs], [1, 2, 3])
         self.assertSequenceEqual([t.para_pos for t in l0.all], [1, 1, 2])
         self.assertSequenceEqual(l0.words, (t1, t3))
+        self.assertSequenceEqual(l0.by_paragraph(1), [t1])
+        self.assertSequenceEqual(l0.by_paragraph(2), [t2, t3])
+        self.assertRaises(IndexError, l0.by_paragraph, 3)
+        self.assertRaises(IndexError, l0.by_position, 0)
+        self.assertIs(l0.by_position(3), t3)
+
+        # The columns follow the Terminals' tags and attributes
+        t2.tag = layer0.NodeTags.Word
+        t3._attrib['text'] = 'three'
+        self.assertSequenceEqual(l0.words, (t1, t2, t3))
+        self.assertEqual(t3.text, 'three')
+
+        # Adding in one pass continues the positions and paragraphs
+        t4, t5, t6 = l0.add_terminals(['4', '.', '6'], [False, True, False],
+                                      [2, 2, 3])
+        self.assertSequenceEqual([t.position for t in (t4, t5, t6)],
+                                 [4, 5, 6])
+        self.assertSequenceEqual([t.para_pos for t in (t4, t5, t6)],
+                                 [3, 4, 1])
+        self.assertTrue(t5.punct)
+        self.assertSequenceEqual(l0.by_paragraph(3), [t6])
+        self.assertRaises(ValueError, l0.add_terminals, ['7', '8'], [False])
+        self.assertRaises(ValueError, l0.add_terminals, ['7'], [False],
+                          [3, 3])
+        self.assertEqual(len(l0.all), 6)
+
+        # Removed Terminals keep their values
+        t5.destroy()
+        t6.destroy()
+        self.assertSequenceEqual([(t.text, t.paragraph, t.para_pos, t.punct)
+                                  for t in (t5, t6)],
+                                 [('.', 2, 4, True), ('6', 3, 1, False)])
 
 
 class Layer1Tests(unittest.TestCase):
@@ -426,6 +687,26 @@ class Layer1Tests(unittest.TestCase):
         self.assertEqual(ps2.fparent, ps23)
         self.assertEqual(d2.fparent, ps2)
 
+        # The relations follow Edge tag changes and removals
+        a3_edge = [e for e in ps3 if e.child == a3][0]
+        a3_edge.tag = layer1.EdgeTags.Process
+        self.assertEqual(ps3.process, a3)
+        self.assertSequenceEqual(ps3.participants, [a4])
+        ps3.remove(a3)
+        self.assertIsNone(ps3.process)
+        ps3.remove(p3)
+        self.assertFalse(ps3.is_scene())
+        self.assertRaises(core.MissingNodeError, ps3.remove, p3)
+
+        # Nodes without children have no index of their Edges
+        self.assertIsNone(terms[0]._by_tag)
+        self.assertIsNone(a4._by_tag)
+        a4.add(layer1.EdgeTags.Process, p3)
+        self.assertEqual(a4.process, p3)
+        self.assertIsNotNone(a4._by_tag)
+        a4.remove(p3)
+        self.assertIsNone(a4._by_tag)
+
     def test_layer1(self):
         p = self._create_passage()
         l1 = p.layer('1')
@@ -446,20 +727,150 @@ class Layer1Tests(unittest.TestCase):
         self.assertSequenceEqual(l1.top_linkages, [lkg2])
 
         # adding process to scene #23, which makes it top level and discards
-        # "top-levelness" from scenes #2 + #3
+        # "top-levelness" from scenes #2 + #3, and so from linkage #2
         l1.add_remote(ps23, layer1.EdgeTags.Process, p1)
         self.assertSequenceEqual(l1.top_scenes, [ps1, ps23])
-        self.assertSequenceEqual(l1.top_linkages, [lkg1, lkg2])
+        self.assertSequenceEqual(l1.top_linkages, [lkg1])
 
         # Changing the process tag of scene #1 to A and back, validate that
         # top scenes are updates accordingly
         p_edge = [e for e in ps1 if e.tag == layer1.EdgeTags.Process][0]
         p_edge.tag = layer1.EdgeTags.Participant
         self.assertSequenceEqual(l1.top_scenes, [ps23])
-        self.assertSequenceEqual(l1.top_linkages, [lkg2])
+        self.assertSequenceEqual(l1.top_linkages, [])
         p_edge.tag = layer1.EdgeTags.Process
         self.assertSequenceEqual(l1.top_scenes, [ps1, ps23])
+        self.assertSequenceEqual(l1.top_linkages, [lkg1])
+
+        # the same top scenes and linkages are computed from scratch
+        p._refresh()
+        self.assertSequenceEqual(l1.top_scenes, [ps1, ps23])
+        self.assertSequenceEqual(l1.top_linkages, [lkg1])
+
+        # removing the process of scene #23 makes scenes #2 + #3 top level
+        # again, and linkage #1 not top level as scene #23 isn't a scene
+        ps23.remove(p1)
+        self.assertSequenceEqual(l1.top_scenes, [ps1, ps2, ps3])
+        self.assertSequenceEqual(l1.top_linkages, [lkg2])
+
+        # a Node which isn't an FNode by its tag isn't a scene
+        ps1.tag = layer1.NodeTags.Punctuation
+        self.assertSequenceEqual(l1.top_scenes, [ps2, ps3])
+        self.assertSequenceEqual(l1.top_linkages, [lkg2])
+        p._refresh()
+        self.assertSequenceEqual(l1.top_scenes, [ps2, ps3])
+        self.assertSequenceEqual(l1.top_linkages, [lkg2])
+
+    def test_bulk(self):
+        def annotate(p):
+            l0 = layer0.Layer0(p)
+            l1 = layer1.Layer1(p)
+            terms = [l0.add_terminal(text=str(i), punct=(i == 6))
+                     for i in range(1, 7)]
+            # [[1 L] [H [2 P] [3 4 A]] [H [5 H [P* 2]] [6 U] H]]
+            link = l1.add_fnode(None, layer1.EdgeTags.Linker)
+            ps1 = l1.add_fnode(None, layer1.EdgeTags.ParallelScene)
+            ps23 = l1.add_fnode(None, layer1.EdgeTags.ParallelScene)
+            ps2 = l1.add_fnode(ps23, layer1.EdgeTags.ParallelScene)
+            p1 = l1.add_fnode(ps1, layer1.EdgeTags.Process)
+            a1 = l1.add_fnode(ps1, layer1.EdgeTags.Participant)
+            link.add(layer1.EdgeTags.Terminal, terms[0])
+            p1.add(layer1.EdgeTags.Terminal, terms[1])
+            a1.add(layer1.EdgeTags.Terminal, terms[3])
+            a1.add(layer1.EdgeTags.Terminal, terms[2])
+            ps2.add(layer1.EdgeTags.Terminal, terms[4])
+            l1.add_punct(ps23, terms[5])
+            l1.add_remote(ps2, layer1.EdgeTags.Process, p1)
+            l1.add_linkage(link, ps1, ps2)
+
+        p1 = core.Passage('1')
+        annotate(p1)
+        p2 = core.Passage('1')
+        with p2.bulk():
+            self.assertTrue(p2.in_bulk)
+            annotate(p2)
+        self.assertFalse(p2.in_bulk)
+
+        self.assertTrue(p1.equals(p2, ordered=True))
+        for lid in (layer0.LAYER_ID, layer1.LAYER_ID):
+            self.assertSequenceEqual([x.ID for x in p1.layer(lid).all],
+                                     [x.ID for x in p2.layer(lid).all])
+            self.assertSequenceEqual([x.ID for x in p1.layer(lid).heads],
+                                     [x.ID for x in p2.layer(lid).heads])
+        l1, l2 = p1.layer(layer1.LAYER_ID), p2.layer(layer1.LAYER_ID)
+        self.assertSequenceEqual([x.ID for x in l2.top_scenes], ['1.3', '1.5'])
+        self.assertSequenceEqual([x.ID for x in l1.top_scenes],
+                                 [x.ID for x in l2.top_scenes])
+        self.assertSequenceEqual([x.ID for x in l1.top_linkages],
+                                 [x.ID for x in l2.top_linkages])
+        self.assertEqual(str(l1.heads[0]), str(l2.heads[0]))
+
+    def test_rollback(self):
+        def state(p):
+            l1 = p.layer(layer1.LAYER_ID)
+            return ([x.ID for x in l1.all], [x.ID for x in l1.heads],
+                    [x.ID for x in l1.top_scenes],
+                    [str(x) for x in l1.heads], p.fingerprint)
+
+        p = self._create_passage()
+        l0, l1 = p.layer(layer0.LAYER_ID), p.layer(layer1.LAYER_ID)
+        head, lkg1, lkg2 = l1.heads
+        link1, ps1, ps23, punct2 = head.children
+        ps2, link2, ps3 = ps23.children
+        original = state(p)
+
+        token1 = p.checkpoint()
+        ps1.destroy()
+        ps4 = l1.add_fnode(None, layer1.EdgeTags.ParallelScene)
+        l1.add_fnode(ps4, layer1.EdgeTags.Process).add(
+            layer1.EdgeTags.Terminal, l0.by_position(2))
+        after_ps4 = state(p)
+        token2 = p.checkpoint()
+        ps23[0].tag = layer1.EdgeTags.Process
+        ps3.attrib['uncertain'] = True
+        head.remove(punct2)
+        self.assertNotEqual(state(p), after_ps4)
+
+        p.rollback(token2)
+        self.assertSequenceEqual(state(p), after_ps4)
+        p.rollback(token1)
+        self.assertSequenceEqual(state(p), original)
         self.assertSequenceEqual(l1.top_linkages, [lkg1, lkg2])
+        self.assertSequenceEqual(head.children, [link1, ps1, ps23, punct2])
+        self.assertRaises(ValueError, p.rollback, token2)
+
+        # parallel Edges are linked back in their order
+        a2 = ps2.participants[0]
+        remote = ps2.add(layer1.EdgeTags.Adverbial, a2,
+                         edge_attrib={'remote': True})
+        edges, incoming = ps2.outgoing, a2.incoming
+        token3 = p.checkpoint()
+        ps2.remove(a2)
+        ps2.remove(remote)
+        p.rollback(token3)
+        self.assertSequenceEqual(ps2.outgoing, edges)
+        self.assertSequenceEqual(a2.incoming, incoming)
+
+        # only the Nodes changed are updated
+        self.assertIsNotNone(ps1.process)
+        self.assertEqual(ps1.end_position, 10)
+        token4 = p.checkpoint()
+        l1.add_fnode(ps3, layer1.EdgeTags.Function).add(
+            layer1.EdgeTags.Terminal, l0.by_position(20))
+        self.assertEqual(ps3.end_position, 20)
+        p.rollback(token4)
+        self.assertEqual(ps3.end_position, 19)
+        self.assertIsNotNone(ps1._by_tag)
+        self.assertIsNotNone(ps1._terminals)
+
+        p.frozen = True
+        self.assertRaises(core.FrozenPassageError, p.rollback, token3)
+        p.frozen = False
+
+        p.commit()
+        self.assertRaises(ValueError, p.rollback, token1)
+        ps1.destroy()
+        self.assertEqual(len(head), 3)
 
     def test_str(self):
         p = self._create_passage()
@@ -469,6 +880,117 @@ class Layer1Tests(unittest.TestCase):
                                   '13 14] [D 15] ] [L 16] [H [A IMPLICIT] [S '
                                   '17 18] [A 19] ] ] [U 20] ',
                                   '1.2-->1.3', '1.11-->1.8,1.12'])
+        fnodes = [x for x in p.layer('1').all
+                  if x.tag == layer1.NodeTags.Foundational]
+        self.assertSequenceEqual(p.layer('1').render(),
+                                 [str(x) for x in fnodes])
+        self.assertSequenceEqual(p.layer('1').render(fnodes[:0:-1]),
+                                 [str(x) for x in fnodes[:0:-1]])
+
+        # FNodes with no Terminals (implicit, or punctuation with its
+        # Terminal removed) are not rendered themselves
+        ps3 = fnodes[0].children[2].children[2]
+        f3 = p.layer('1').add_fnode(ps3, layer1.EdgeTags.Function)
+        punct = p.layer('1').add_punct(f3, p.layer('0').by_position(20))
+        self.assertEqual(str(ps3), '[A IMPLICIT] [S 17 18] [A 19] '
+                                   '[F [U 20] ] ')
+        punct.remove(punct.children[0])
+        self.assertEqual(str(ps3), '[A IMPLICIT] [F IMPLICIT] [S 17 18] '
+                                   '[A 19] ')
+        self.assertSequenceEqual(p.layer('1').render([fnodes[0], ps3]),
+                                 [str(fnodes[0]), str(ps3)])
+
+    def test_ancestors(self):
+        p = self._create_passage()
+        l1 = p.layer('1')
+        head, lkg1, lkg2 = l1.heads
+        link1, ps1, ps23, punct2 = head.children
+        p1, a1, punct1 = [x.child for x in ps1 if not x.attrib.get('remote')]
+        ps2, link2, ps3 = ps23.children
+        a2, d2 = [x.child for x in ps2 if not x.attrib.get('remote')]
+
+        self.assertSequenceEqual([x.depth for x in (head, ps1, p1, ps2, a2)],
+                                 [0, 1, 2, 2, 3])
+        self.assertTrue(head.is_ancestor(p1))
+        self.assertFalse(ps2.is_ancestor(p1))  # remote Edge
+        self.assertFalse(ps1.is_ancestor(ps1))
+        self.assertIs(p1.lca(a2), head)
+        self.assertIs(a2.lca(d2), ps2)
+        self.assertIs(ps2.lca(a2), ps2)
+        self.assertIsNone(p1.lca(lkg1))
+        self.assertSequenceEqual(a2.ancestors_with_tag(layer1.EdgeTags.
+                                                       ParallelScene),
+                                 [ps2, ps23])
+        self.assertIs(a2.get_top_scene(), ps2)
+
+        # the Passage head as a scene doesn't cover the scenes below it
+        head_p = head.add(layer1.EdgeTags.Process, p1,
+                          edge_attrib={'remote': True})
+        self.assertIs(head.get_top_scene(), head)
+        self.assertIs(ps1.get_top_scene(), ps1)
+        self.assertIs(a2.get_top_scene(), ps2)
+        self.assertIs(link2.get_top_scene(), head)
+        head.remove(head_p)
+        self.assertIsNone(link2.get_top_scene())
+
+        ps23.remove(ps2)
+        self.assertEqual(a2.depth, 1)
+        self.assertIsNone(a2.lca(p1))
+        self.assertIsNone(ps2.fparent)
+        self.assertSequenceEqual(a2.ancestors_with_tag(layer1.EdgeTags.
+                                                       ParallelScene), [])
+
+    def test_spans(self):
+        p = self._create_passage()
+        terms = p.layer('0').all
+        l1 = p.layer('1')
+        head = l1.heads[0]
+        link1, ps1, ps23, punct2 = head.children
+        p1, a1, punct1 = [x.child for x in ps1 if not x.attrib.get('remote')]
+        ps2, link2, ps3 = ps23.children
+
+        self.assertSequenceEqual(ps1.get_terminals(), terms[1:10])
+        self.assertEqual(ps23.end_position, 19)
+        self.assertFalse(ps2.discontiguous)
+
+        # changes below an FNode change its span and the spans above it
+        ps1.remove(a1)
+        self.assertSequenceEqual(ps1.get_terminals(),
+                                 terms[1:5] + terms[9:10])
+        self.assertSequenceEqual(ps1.get_sequences(), [(2, 5), (10, 10)])
+        ps1.add(layer1.EdgeTags.Participant, a1)
+        self.assertSequenceEqual(head.get_terminals(), terms)
+        edge = [x for x in ps2 if x.attrib.get('remote')][0]
+        edge.attrib['remote'] = False
+        self.assertSequenceEqual(ps2.get_terminals(),
+                                 terms[1:5] + terms[10:15])
+        self.assertTrue(ps2.discontiguous)
+        self.assertEqual(ps23.start_position, 2)
+        with p.bulk():
+            ps1.remove(p1)
+            self.assertEqual(ps1.start_position, 6)
+        self.assertEqual(head.to_text(), ' '.join(x.text for x in terms))
+
+    def test_span_queries(self):
+        p = self._create_passage()
+        l1 = p.layer('1')
+        ids = lambda nodes: [x.ID for x in nodes]
+        self.assertSequenceEqual(ids(l1.covering(7)), ['1.1', '1.3', '1.5'])
+        self.assertSequenceEqual(ids(l1.covering(5, 6)), ['1.1', '1.3'])
+        self.assertSequenceEqual(ids(l1.overlapping(10, 11)),
+                                 ['1.1', '1.3', '1.7', '1.8', '1.9'])
+        self.assertSequenceEqual(ids(l1.contained_in(11, 16)),
+                                 ['1.8', '1.9', '1.10', '1.11'])
+        self.assertSequenceEqual(l1.covering(21), [])
+
+        # the remote Participant makes 1.8 discontiguous
+        edge = [x for x in p.by_id('1.8') if x.attrib.get('remote')][0]
+        edge.attrib['remote'] = False
+        self.assertSequenceEqual(ids(l1.covering(5)), ['1.1', '1.3', '1.4',
+                                                       '1.7', '1.8'])
+        self.assertSequenceEqual(ids(l1.covering(8)), ['1.1', '1.3', '1.5'])
+        self.assertSequenceEqual(ids(l1.contained_in(11, 16)),
+                                 ['1.9', '1.10', '1.11'])
 
     def test_destroy(self):
         p = self._create_passage()
@@ -488,6 +1010,95 @@ class Layer1Tests(unittest.TestCase):
         self.assertSequenceEqual(p1.parents, [ps2])
         self.assertFalse(a1.parents)
         self.assertFalse(punct1.parents)
+        self.assertTrue(l1.is_head(a1) and l1.is_head(punct1))
+
+        # Removing Edges to Terminals doesn't make them heads of layer 1
+        a1.destroy()
+        self.assertSequenceEqual(l1.heads, [head, punct1, lkg1, lkg2])
+
+        # IDs of removed Nodes are not reused
+        ids = {x.ID for x in l1.all} | {ps1.ID, a1.ID}
+        ps4, ps5 = l1.add_fnodes(None, [layer1.EdgeTags.ParallelScene] * 2)
+        punct3, = l1.add_puncts(ps4, [p.layer('0').all[0]])
+        self.assertFalse({ps4.ID, ps5.ID, punct3.ID} & ids)
+        self.assertSequenceEqual(head.children[-2:], [ps4, ps5])
+        self.assertSequenceEqual(ps4.punctuation, [punct3])
+
+    def test_pickling(self):
+        p1 = self._create_passage()
+        p2 = pickle.loads(pickle.dumps(p1))
+        self.assertTrue(p1.equals(p2, ordered=True))
+        l1 = p2.layer('1')
+        head, lkg1, lkg2 = l1.heads
+        ps1 = head.children[1]
+        p1, a1, punct1 = [x.child for x in ps1 if not x.attrib.get('remote')]
+        ps1.destroy()
+        self.assertSequenceEqual(l1.heads, [head, a1, punct1, lkg1, lkg2])
+
+    def test_compile(self):
+        p = self._create_passage()
+        p.frozen = True
+        c = p.compile()
+        self.assertIs(c, p.compile())
+        self.assertEqual(len(c), len(p.nodes))
+        for node in p.nodes.values():
+            i = c.index(node.ID)
+            self.assertIs(c.node(i), node)
+            self.assertEqual(c.tag(i), node.tag)
+            self.assertSequenceEqual([c.node(x) for x in c.children(i)],
+                                     node.children)
+            self.assertSequenceEqual([c.node(x) for x in c.parents(i)],
+                                     node.parents)
+            self.assertSequenceEqual([c.edge_tag(x) for x in c.outgoing(i)],
+                                     [x.tag for x in node])
+            if node.tag == layer1.NodeTags.Foundational:
+                self.assertEqual(c.ftag(i), node.ftag)
+                self.assertEqual(c.is_scene(i), node.is_scene())
+                self.assertEqual(c.start_position(i), node.start_position)
+                self.assertEqual(c.end_position(i), node.end_position)
+                self.assertSequenceEqual(
+                    [c.node(x) for x in c.terminals(i)],
+                    node.get_terminals())
+        self.assertSequenceEqual([c.node(x) for x in c.heads('1')],
+                                 p.layer('1').heads)
+        head = p.layer('1').heads[0]
+        self.assertEqual(c.fparent(c.index(head.ID)), -1)
+        self.assertEqual(c.fparent(c.index(head.children[1].ID)),
+                         c.index(head.ID))
+        self.assertEqual(c.code('no such tag'), -1)
+
+        p.frozen = False
+        p.layer('1').heads[0].destroy()
+        self.assertIsNot(c, p.compile())
+        self.assertEqual(len(c), len(p.nodes) + 1)
+
+    def test_frozen(self):
+        p = self._create_passage()
+        l0, l1 = p.layer('0'), p.layer('1')
+        fnodes = [x for x in l1.all if x.tag == layer1.NodeTags.Foundational]
+
+        def state():
+            return ([(x.fparent, x.ftag, x.get_top_scene(), x.discontiguous)
+                     for x in fnodes], l0.words, l0.pairs)
+
+        original = state()
+        p.frozen = True
+        self.assertSequenceEqual(state(), original)
+        self.assertIs(l0.words, l0.words)
+        unpickled = pickle.loads(pickle.dumps(p))
+        self.assertTrue(unpickled.frozen)
+        self.assertSequenceEqual([x.ID for x in unpickled.layer('0').words],
+                                 [x.ID for x in l0.words])
+
+        # Unfreezing drops the memoized values
+        p.frozen = False
+        head, lkg1, lkg2 = l1.heads
+        ps1 = head.children[1]
+        p1 = ps1.process
+        self.assertIs(p1.get_top_scene(), ps1)
+        ps1.destroy()
+        self.assertNotIn(ps1, [x.fparent for x in fnodes])
+        self.assertIsNone(p1.get_top_scene())
 
     def _create_discontiguous(self):
         """Creates a highly-dicontiguous Passage object."""
@@ -737,6 +1348,32 @@ class ConversionTests(unittest.TestCase):
         ref = convert.from_site(self._load_xml('./site3.xml'))
         self.assertTrue(passage.equals(ref, ordered=True))
 
+    def test_old_pickle(self):
+        # site3.xml converted, frozen and pickled before the elements had
+        # __slots__ and the Layers kept their derived state
+        with open('./site3-baseline.pickle', 'rb') as f:
+            passage = pickle.load(f)
+        ref = convert.from_site(self._load_xml('./site3.xml'))
+        self.assertTrue(passage.frozen)
+        self.assertTrue(passage.equals(ref, ordered=True))
+        self.assertEqual(passage.fingerprint, ref.fingerprint)
+        l0, l1 = passage.layer('0'), passage.layer('1')
+        ref_l0, ref_l1 = ref.layer('0'), ref.layer('1')
+        self.assertSequenceEqual([x.ID for x in l0.words],
+                                 [x.ID for x in ref_l0.words])
+        self.assertSequenceEqual([x.ID for x in l1.top_scenes],
+                                 [x.ID for x in ref_l1.top_scenes])
+        self.assertSequenceEqual([x.ID for x in l1.top_linkages],
+                                 [x.ID for x in ref_l1.top_linkages])
+        self.assertSequenceEqual(l1.render(), ref_l1.render())
+        passage.frozen = False
+        fnode = l1.add_fnode(None, layer1.EdgeTags.ParallelScene)
+        fnode.add(layer1.EdgeTags.Terminal, l0.by_position(1))
+        self.assertNotIn(fnode.ID, ref.nodes)
+        self.assertEqual(fnode.start_position, 1)
+        self.assertTrue(passage.equals(pickle.loads(pickle.dumps(passage)),
+                                       ordered=True))
+
     def test_from_text(self):
         sample = ['Hello . again', 'nice', ' ?! end', '']
         passage = convert.from_text(sample)
@@ -804,6 +1441,17 @@ class UtilTests(unittest.TestCase):
 
         self.assertSequenceEqual(util.break2sentences(p), [4, 7, 11])
 
+    def test_find_duplicates(self):
+        passages = [convert.from_site(ConversionTests._load_xml(path))
+                    for path in ('./site1.xml', './site2.xml', './site3.xml',
+                                 './site2.xml')]
+        passages.append(convert.from_standard(
+            convert.to_standard(passages[2])))
+        groups = util.find_duplicates(passages)
+        self.assertEqual(len(groups), 2)
+        self.assertSequenceEqual(groups[0], [passages[1], passages[3]])
+        self.assertSequenceEqual(groups[1], [passages[2], passages[4]])
+
 
 class ScenesTests(unittest.TestCase):
 
@@ -1,5 +1,7 @@
 """Utility functions for UCCA package."""
 
+import collections
+
 from ucca import layer0, layer1
 
 
@@ -35,3 +37,36 @@ def break2sentences(passage):
     marks = [x for x in marks
              if x in ps_ends or ((x - 1) in ps_ends and x not in ps_starts)]
     return sorted(set(marks + paragraph_ends))
+
+
+def find_duplicates(passages):
+    """Finds groups of equivalent Passages, e.g. duplicate annotations.
+
+    Passages are grouped by their fingerprints, so only Passages with the
+    same fingerprint are compared (using Passage.equals, as fingerprints may
+    rarely collide). The Passage IDs are not taken into account.
+
+    Args:
+        passages: iterable of core.Passage objects
+
+    Returns:
+        a list of groups (lists) of at least two equivalent Passages, in
+        the order they were given.
+
+    """
+    by_fingerprint = collections.OrderedDict()
+    for passage in passages:
+        by_fingerprint.setdefault(passage.fingerprint, []).append(passage)
+    groups = []
+    for candidates in by_fingerprint.values():
+        while len(candidates) > 1:
+            group, rest = [candidates[0]], []
+            for passage in candidates[1:]:
+                if candidates[0].equals(passage):
+                    group.append(passage)
+                else:
+                    rest.append(passage)
+            if len(group) > 1:
+                groups.append(group)
+            candidates = rest
+    return groups